@@ -0,0 +1,27 @@
+"""add content_hash columns to products and users
+
+Revision ID: 3f6c2a9d8e41
+Revises: ba8b1a6d6b7c
+Create Date: 2026-10-18 10:12:31.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3f6c2a9d8e41'
+down_revision: Union[str, Sequence[str], None] = 'ba8b1a6d6b7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column('products', sa.Column('content_hash', sa.String(32), nullable=True))
+    op.add_column('users', sa.Column('content_hash', sa.String(32), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'content_hash')
+    op.drop_column('products', 'content_hash')
@@ -0,0 +1,25 @@
+"""add products price index
+
+Revision ID: 5b8e1d7c2f90
+Revises: 3f6c2a9d8e41
+Create Date: 2026-10-18 11:02:47.581930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5b8e1d7c2f90'
+down_revision: Union[str, Sequence[str], None] = '3f6c2a9d8e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index('ix_products_price', 'products', [sa.text('price DESC')])
+
+
+def downgrade():
+    op.drop_index('ix_products_price', table_name='products')
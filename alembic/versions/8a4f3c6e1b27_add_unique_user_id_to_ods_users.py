@@ -0,0 +1,28 @@
+"""add unique user_id index to ods_users
+
+Revision ID: 8a4f3c6e1b27
+Revises: 5b8e1d7c2f90
+Create Date: 2026-10-18 11:48:05.337162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '8a4f3c6e1b27'
+down_revision: Union[str, Sequence[str], None] = '5b8e1d7c2f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute(
+        "DELETE FROM ods_users a USING ods_users b "
+        "WHERE a.user_id = b.user_id AND a.id > b.id"
+    )
+    op.create_index('uq_ods_users_user_id', 'ods_users', ['user_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_ods_users_user_id', table_name='ods_users')
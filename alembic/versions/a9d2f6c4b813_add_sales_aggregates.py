@@ -0,0 +1,100 @@
+"""add sales aggregates
+
+Revision ID: a9d2f6c4b813
+Revises: f1c8b5a2e934
+Create Date: 2026-10-18 18:04:12.770395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision: str = 'a9d2f6c4b813'
+down_revision: Union[str, Sequence[str], None] = 'f1c8b5a2e934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIMENSIONS = ("category", "brand")
+
+
+def _mark_dirty(transition_table: str) -> str:
+    return "\n".join(
+        f"""
+        INSERT INTO sales_aggregates_dirty (dimension, key)
+        SELECT DISTINCT '{dimension}', COALESCE({dimension}, '') FROM {transition_table}
+        ON CONFLICT DO NOTHING;"""
+        for dimension in DIMENSIONS
+    )
+
+
+def upgrade():
+    op.create_table(
+        'sales_aggregates',
+        sa.Column('dimension', sa.String(20), primary_key=True),
+        sa.Column('key', sa.String(100), primary_key=True),
+        sa.Column('product_count', sa.Integer, nullable=False),
+        sa.Column('min_price', sa.Float),
+        sa.Column('avg_price', sa.Float),
+        sa.Column('max_price', sa.Float),
+        sa.Column('discounted_count', sa.Integer, nullable=False),
+        sa.Column('avg_discount', sa.Float),
+        sa.Column('discount_distribution', JSONB, nullable=False),
+        sa.Column('on_sale_count', sa.Integer, nullable=False),
+        sa.Column('on_sale_share', sa.Float, nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    )
+
+    # Groups whose aggregates are stale, filled by the products triggers
+    op.create_table(
+        'sales_aggregates_dirty',
+        sa.Column('dimension', sa.String(20), primary_key=True),
+        sa.Column('key', sa.String(100), primary_key=True),
+    )
+
+    op.execute(f"""
+        CREATE FUNCTION mark_sales_aggregates_dirty() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {_mark_dirty('new_rows')}
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {_mark_dirty('old_rows')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    # Statement-level triggers see every changed row at once through the
+    # transition tables, which allow only one event per trigger
+    op.execute("""
+        CREATE TRIGGER products_sales_aggregates_insert
+        AFTER INSERT ON products REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mark_sales_aggregates_dirty()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_sales_aggregates_update
+        AFTER UPDATE ON products REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mark_sales_aggregates_dirty()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_sales_aggregates_delete
+        AFTER DELETE ON products REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mark_sales_aggregates_dirty()
+    """)
+
+    # Existing products are aggregated by the first refresh
+    op.execute(_mark_dirty('products'))
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS products_sales_aggregates_delete ON products")
+    op.execute("DROP TRIGGER IF EXISTS products_sales_aggregates_update ON products")
+    op.execute("DROP TRIGGER IF EXISTS products_sales_aggregates_insert ON products")
+    op.execute("DROP FUNCTION IF EXISTS mark_sales_aggregates_dirty()")
+    op.drop_table('sales_aggregates_dirty')
+    op.drop_table('sales_aggregates')
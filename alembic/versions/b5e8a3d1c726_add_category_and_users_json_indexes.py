@@ -0,0 +1,50 @@
+"""add category and users json indexes
+
+Revision ID: b5e8a3d1c726
+Revises: a9d2f6c4b813
+Create Date: 2026-10-18 18:47:39.106254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b5e8a3d1c726'
+down_revision: Union[str, Sequence[str], None] = 'a9d2f6c4b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# products(price DESC) and the unique ods_users(user_id) index already exist,
+# see revisions 5b8e1d7c2f90 and 8a4f3c6e1b27
+JSON_COLUMNS = ('name', 'address')
+
+
+def _column_type(table: str, column: str) -> str:
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table "
+            "AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def upgrade():
+    op.create_index('ix_products_category', 'products', ['category'])
+
+    for column in JSON_COLUMNS:
+        # Databases created from the ORM models may still hold plain json
+        if _column_type('users', column) != 'jsonb':
+            op.execute(
+                f'ALTER TABLE users ALTER COLUMN "{column}" TYPE jsonb USING "{column}"::jsonb'
+            )
+        op.create_index(f'ix_users_{column}_gin', 'users', [column], postgresql_using='gin')
+
+
+def downgrade():
+    for column in reversed(JSON_COLUMNS):
+        op.drop_index(f'ix_users_{column}_gin', table_name='users')
+    op.drop_index('ix_products_category', table_name='products')
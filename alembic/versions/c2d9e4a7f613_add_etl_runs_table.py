@@ -0,0 +1,40 @@
+"""add etl_runs table
+
+Revision ID: c2d9e4a7f613
+Revises: 8a4f3c6e1b27
+Create Date: 2026-10-18 13:21:54.902214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision: str = 'c2d9e4a7f613'
+down_revision: Union[str, Sequence[str], None] = '8a4f3c6e1b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'etl_runs',
+        sa.Column('run_id', sa.String(32), primary_key=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+        sa.Column('success', sa.Boolean, nullable=False),
+        sa.Column('duration_seconds', sa.Float),
+        sa.Column('db_seconds', sa.Float),
+        sa.Column('stages', JSONB),
+        sa.Column('stats', JSONB),
+        sa.Column('bytes_fetched', JSONB),
+        sa.Column('transformations', JSONB),
+    )
+    op.create_index('ix_etl_runs_started_at', 'etl_runs', ['started_at'])
+
+
+def downgrade():
+    op.drop_index('ix_etl_runs_started_at', table_name='etl_runs')
+    op.drop_table('etl_runs')
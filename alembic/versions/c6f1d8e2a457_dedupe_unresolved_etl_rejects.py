@@ -0,0 +1,52 @@
+"""dedupe unresolved etl_rejects
+
+Revision ID: c6f1d8e2a457
+Revises: b5e8a3d1c726
+Create Date: 2026-10-19 10:12:44.381907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c6f1d8e2a457'
+down_revision: Union[str, Sequence[str], None] = 'b5e8a3d1c726'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Keep the newest open reject per record, counting the dropped ones as attempts
+    op.execute("""
+        WITH ranked AS (
+            SELECT
+                id,
+                row_number() OVER w AS position,
+                count(*) OVER (PARTITION BY source, stage, record_id) AS copies
+            FROM etl_rejects
+            WHERE resolved_at IS NULL AND record_id IS NOT NULL
+            WINDOW w AS (PARTITION BY source, stage, record_id ORDER BY id DESC)
+        ),
+        kept AS (
+            UPDATE etl_rejects r
+            SET attempts = r.attempts + ranked.copies - 1
+            FROM ranked
+            WHERE r.id = ranked.id AND ranked.position = 1 AND ranked.copies > 1
+        )
+        DELETE FROM etl_rejects r
+        USING ranked
+        WHERE r.id = ranked.id AND ranked.position > 1
+    """)
+    op.create_index(
+        'uq_etl_rejects_unresolved_record',
+        'etl_rejects',
+        ['source', 'stage', 'record_id'],
+        unique=True,
+        postgresql_where=sa.text('resolved_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_etl_rejects_unresolved_record', table_name='etl_rejects')
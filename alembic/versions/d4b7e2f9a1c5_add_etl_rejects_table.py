@@ -0,0 +1,41 @@
+"""add etl_rejects table
+
+Revision ID: d4b7e2f9a1c5
+Revises: c2d9e4a7f613
+Create Date: 2026-10-18 15:02:31.417805
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision: str = 'd4b7e2f9a1c5'
+down_revision: Union[str, Sequence[str], None] = 'c2d9e4a7f613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        'etl_rejects',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('source', sa.String(100), nullable=False),
+        sa.Column('record_id', sa.String(100)),
+        sa.Column('run_id', sa.String(32)),
+        sa.Column('payload', JSONB),
+        sa.Column('errors', JSONB),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+    )
+    op.create_index(
+        'ix_etl_rejects_source_created_at', 'etl_rejects', ['source', 'created_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_etl_rejects_source_created_at', table_name='etl_rejects')
+    op.drop_table('etl_rejects')
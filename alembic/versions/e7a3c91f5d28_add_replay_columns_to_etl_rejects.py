@@ -0,0 +1,44 @@
+"""add replay columns to etl_rejects
+
+Revision ID: e7a3c91f5d28
+Revises: d4b7e2f9a1c5
+Create Date: 2026-10-18 16:10:47.285310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e7a3c91f5d28'
+down_revision: Union[str, Sequence[str], None] = 'd4b7e2f9a1c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Rows written before this revision all come from schema validation
+    op.add_column(
+        'etl_rejects',
+        sa.Column('stage', sa.String(20), nullable=False, server_default='validate'),
+    )
+    op.alter_column('etl_rejects', 'stage', server_default=None)
+    op.add_column(
+        'etl_rejects',
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+    )
+    op.add_column('etl_rejects', sa.Column('resolved_at', sa.DateTime(timezone=True)))
+    op.create_index(
+        'ix_etl_rejects_unresolved',
+        'etl_rejects',
+        ['source', 'id'],
+        postgresql_where=sa.text('resolved_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_etl_rejects_unresolved', table_name='etl_rejects')
+    op.drop_column('etl_rejects', 'resolved_at')
+    op.drop_column('etl_rejects', 'attempts')
+    op.drop_column('etl_rejects', 'stage')
@@ -0,0 +1,57 @@
+"""add product materialized views
+
+Revision ID: f1c8b5a2e934
+Revises: e7a3c91f5d28
+Create Date: 2026-10-18 17:26:03.519842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'f1c8b5a2e934'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c91f5d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # The top-N size is fixed in the view definition (MOST_EXPENSIVE_LIMIT default)
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_most_expensive AS
+        SELECT
+            p.id AS product_id,
+            p.title AS product_name,
+            p.price,
+            p.category
+        FROM products p
+        ORDER BY p.price DESC, p.id
+        LIMIT 10
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX uq_mv_most_expensive_product_id "
+        "ON mv_most_expensive (product_id)"
+    )
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_category_summary AS
+        SELECT
+            COALESCE(p.category, '') AS category,
+            count(*) AS product_count,
+            min(p.price) AS min_price,
+            avg(p.price) AS avg_price,
+            max(p.price) AS max_price,
+            count(*) FILTER (WHERE p.on_sale) AS on_sale_count
+        FROM products p
+        GROUP BY COALESCE(p.category, '')
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX uq_mv_category_summary_category "
+        "ON mv_category_summary (category)"
+    )
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_category_summary")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_most_expensive")
@@ -0,0 +1,63 @@
+"""
+Compare the row-dict transform with the columnar transform on synthetic products.
+
+Only the in-process transform (including content hashing) is measured, no
+database is needed:
+
+    python -m src.benchmarks.columnar 10000 100000 1000000
+"""
+import sys
+import time
+import typing as t
+
+from src.core.columnar import np
+from src.core.data_extraction import BaseDataLoader
+from src.core.data_loader import SOURCES
+
+
+def make_raw_products(count: int) -> t.List[t.Dict[str, t.Any]]:
+    return [
+        {
+            "id": i,
+            "title": f"Product {i}",
+            "image": f"https://example.com/{i}.png",
+            "price": str(float(i % 5000) + 0.99),
+            "description": "Synthetic benchmark product",
+            "brand": f"brand-{i % 50}",
+            "model": f"model-{i % 500}",
+            "color": "black",
+            "category": f"category-{i % 10}",
+            "discount": i % 40,
+            "onSale": i % 3 == 0,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(label: str, count: int, func: t.Callable[[], t.Any]) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>22}: {count:>9} records in {elapsed:.3f}s ({count / elapsed:,.0f} records/s)")
+
+
+def main(counts: t.List[int]) -> None:
+    spec = SOURCES["products"]
+    print(f"numpy conversions: {'enabled' if np is not None else 'not installed'}")
+
+    for count in counts:
+        raw = make_raw_products(count)
+        measure("dict", count, lambda: spec.transform(raw))
+        measure("columnar", count, lambda: spec.columnar_transform(raw))
+        measure(
+            "dict + hashing", count,
+            lambda: BaseDataLoader.add_content_hashes(spec.transform(raw)),
+        )
+        measure(
+            "columnar + hashing", count,
+            lambda: BaseDataLoader.add_content_hashes(spec.columnar_transform(raw)),
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,47 @@
+"""
+Compare JSON decoding of a synthetic products response across backends.
+
+Every installed backend is measured on the same payload, no network or
+database is needed:
+
+    python -m src.benchmarks.json_codec 1000 10000 100000
+"""
+import json
+import sys
+import time
+import typing as t
+
+from src.benchmarks.columnar import make_raw_products
+from src.core.utils import json_codec
+from src.core.utils.json_codec import msgspec, orjson
+
+
+def decoders() -> t.Dict[str, t.Callable[[bytes], t.Any]]:
+    available = {"json": json.loads}
+    if orjson is not None:
+        available["orjson"] = orjson.loads
+    if msgspec is not None:
+        available["msgspec"] = msgspec.json.Decoder().decode
+    return available
+
+
+def measure(label: str, payload: bytes, decode: t.Callable[[bytes], t.Any], repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        decode(payload)
+    elapsed = (time.perf_counter() - started) / repeat
+    megabytes = len(payload) / 1024 / 1024
+    print(f"{label:>10}: {elapsed * 1000:9.2f} ms per decode ({megabytes / elapsed:,.1f} MiB/s)")
+
+
+def main(counts: t.List[int], repeat: int = 5) -> None:
+    print(f"selected backend: {json_codec.BACKEND}")
+    for count in counts:
+        payload = json.dumps({"items": make_raw_products(count)}).encode()
+        print(f"{count} products, {len(payload) / 1024 / 1024:.1f} MiB")
+        for label, decode in decoders().items():
+            measure(label, payload, decode, repeat)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,78 @@
+"""
+Compare the executemany upsert path with the COPY + merge path.
+
+Rows are loaded into a throwaway copy of the products table, created with
+``LIKE products`` so it carries the same keys and indexes under its own index
+names. The real data is never touched, but the database must be migrated:
+
+    python -m src.benchmarks.load_modes 10000 100000
+"""
+import sys
+import time
+import asyncio
+import typing as t
+
+from sqlalchemy import MetaData
+
+from src.config.database import EtlSessionLocal, etl_engine
+from src.core.data_loader import ProductDataLoader
+from src.db.table import ProductDB
+
+BENCH_TABLE = "products_benchmark"
+
+# Only used to build statements; the table itself is created from the live products table
+bench_table = ProductDB.__table__.to_metadata(MetaData(), name=BENCH_TABLE)
+
+
+def make_products(count: int) -> t.List[t.Dict[str, t.Any]]:
+    return [
+        {
+            "id": i,
+            "title": f"Product {i}",
+            "image": f"https://example.com/{i}.png",
+            "price": float(i % 5000) + 0.99,
+            "description": "Synthetic benchmark product",
+            "brand": f"brand-{i % 50}",
+            "model": f"model-{i % 500}",
+            "color": "black",
+            "category": f"category-{i % 10}",
+            "discount": i % 40,
+            "popular": i % 7 == 0,
+            "on_sale": i % 3 == 0,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+async def bench(count: int) -> None:
+    products = make_products(count)
+
+    for mode in ("upsert", "copy"):
+        loader = ProductDataLoader(load_mode=mode)
+        async with EtlSessionLocal() as session:
+            started = time.perf_counter()
+            if mode == "copy":
+                await loader.copy_data(session, bench_table, products)
+            else:
+                await loader.upsert_data(session, bench_table, products)
+            elapsed = time.perf_counter() - started
+        print(f"{mode:>6}: {count} rows in {elapsed:.3f}s ({count / elapsed:,.0f} rows/s)")
+
+
+async def main(counts: t.List[int]) -> None:
+    async with etl_engine.begin() as conn:
+        await conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{BENCH_TABLE}"')
+        await conn.exec_driver_sql(
+            f'CREATE TABLE "{BENCH_TABLE}" (LIKE "{ProductDB.__tablename__}" INCLUDING ALL)'
+        )
+    try:
+        for count in counts:
+            await bench(count)
+    finally:
+        async with etl_engine.begin() as conn:
+            await conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{BENCH_TABLE}_staging"')
+            await conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{BENCH_TABLE}"')
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]))
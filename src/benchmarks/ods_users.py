@@ -0,0 +1,36 @@
+"""
+Compare the per-row Python OdsUsersTransformer path with the SQL pushdown path.
+
+Both runs rebuild ods_users from the current contents of users, so load a
+representative users table first:
+
+    python -m src.benchmarks.ods_users 5
+"""
+import sys
+import time
+import asyncio
+import statistics
+
+from src.config.database import EtlSessionLocal
+from src.core.data_transform import OdsUsersTransformer
+
+
+async def main(repeat: int) -> None:
+    for pushdown in (False, True):
+        timings = []
+        count = 0
+        for _ in range(repeat):
+            async with EtlSessionLocal() as session:
+                started = time.perf_counter()
+                count = await OdsUsersTransformer.transform(session, pushdown=pushdown)
+                timings.append(time.perf_counter() - started)
+
+        label = "pushdown" if pushdown else "python"
+        print(
+            f"{label:>8}: {count} users, median {statistics.median(timings):.3f}s, "
+            f"best {min(timings):.3f}s over {repeat} runs"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
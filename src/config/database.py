@@ -1,18 +1,146 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import time
+import typing as t
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from src.config.settings import settings
+from src.core.metrics import DB_STATEMENT_DURATION
+from src.core.utils import json_codec
+
+
+class PoolMetrics:
+    """Counts connection pool checkouts/checkins and how long connections are held"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.held_seconds = 0.0
+
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        connection_record.info["checkout_started"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.checkins += 1
+        started = connection_record.info.pop("checkout_started", None)
+        if started is not None:
+            self.held_seconds += time.perf_counter() - started
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def snapshot(self) -> t.Dict[str, float]:
+        pool = self.engine.sync_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "connects_total": self.connects,
+            "checkouts_total": self.checkouts,
+            "checkins_total": self.checkins,
+            "invalidations_total": self.invalidations,
+            "held_seconds_total": self.held_seconds,
+        }
+
+
+def create_engine(
+        name: str,
+        pool_size: int,
+        max_overflow: int,
+        statement_timeout_ms: int
+) -> AsyncEngine:
+    """
+    Build an async engine tuned by the DB_* settings
+
+    Args:
+        name: Engine label used in the statement-time metrics
+        pool_size: Number of connections kept open in the pool
+        max_overflow: Extra connections allowed above pool_size under load
+        statement_timeout_ms: PostgreSQL statement_timeout, 0 disables it
+    """
+    connect_args = {"prepare_threshold": settings.DB_PREPARE_THRESHOLD}
+    if statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DB_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        json_serializer=json_codec.dumps,
+        json_deserializer=json_codec.loads,
+    )
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.driver_connection.prepared_max = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _observe_statement_time(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["statement_started"].pop()
+        DB_STATEMENT_DURATION.observe(time.perf_counter() - started, engine=name)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _discard_statement_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started"):
+            connection.info["statement_started"].pop()
+
+    return engine
+
+
+engine = create_engine(
+    "api",
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
+    settings.DB_STATEMENT_TIMEOUT_MS,
 )
 
+etl_engine = create_engine(
+    "etl",
+    settings.ETL_DB_POOL_SIZE,
+    settings.ETL_DB_MAX_OVERFLOW,
+    settings.ETL_DB_STATEMENT_TIMEOUT_MS,
+)
+
+pool_metrics = {
+    "api": PoolMetrics(engine),
+    "etl": PoolMetrics(etl_engine),
+}
+
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+EtlSessionLocal = sessionmaker(
+    bind=etl_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
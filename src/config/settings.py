@@ -1,3 +1,4 @@
+import typing as t
 from pydantic.v1 import BaseSettings
 
 
@@ -12,6 +13,59 @@ class Settings(BaseSettings):
     API_PRODUCTS: str
     API_USERS: str
 
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_PREPARE_THRESHOLD: int = 5
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    ETL_DB_POOL_SIZE: int = 5
+    ETL_DB_MAX_OVERFLOW: int = 5
+    ETL_DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    ETL_SCHEDULE_ENABLED: bool = True
+    ETL_SCHEDULE_INTERVAL_SECONDS: float = 3600.0
+    ETL_SCHEDULE_CRON: t.Optional[str] = None
+    ETL_RUN_ON_STARTUP: bool = True
+
+    ETL_PAGE_SIZE: int = 100
+    ETL_UPSERT_BATCH_SIZE: int = 1000
+    ETL_LOAD_MODE: str = "upsert"
+    ETL_INCREMENTAL: bool = False
+    ETL_COLUMNAR: bool = False
+    ETL_CONCURRENT_LOAD: bool = False
+    ETL_MAX_CONCURRENCY: int = 2
+    ETL_VALIDATE: bool = True
+
+    MOST_EXPENSIVE_LIMIT: int = 10
+    MART_BACKEND: str = "table"
+    MART_SHADOW_BUILD: bool = False
+    MART_SWAP_LOCK_TIMEOUT_MS: int = 5000
+    ODS_USERS_PUSHDOWN: bool = True
+    ODS_USERS_INCREMENTAL: bool = False
+
+    TABLE_COUNT_CACHE_TTL: float = 60.0
+    TABLE_COUNT_ESTIMATE_THRESHOLD: int = 100000
+    EXPORT_BATCH_SIZE: int = 1000
+    PAGE_CACHE_SIZE: int = 256
+    PAGE_CACHE_TTL: float = 300.0
+    DATA_VERSION_TTL: float = 5.0
+
+    JSON_BACKEND: str = "auto"
+
+    HTTP_TIMEOUT: float = 30.0
+    HTTP2: bool = False
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_RETRIES: int = 3
+    HTTP_BACKOFF_BASE: float = 0.5
+    HTTP_BACKOFF_MAX: float = 10.0
+    HTTP_RATE_LIMIT_PER_HOST: float = 0.0
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
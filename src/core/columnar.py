@@ -0,0 +1,94 @@
+import typing as t
+from itertools import repeat
+
+from src.core.transform_codegen import Field, FieldMapping, Row, TransformCodegen
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, conversions fall back to map()
+    np = None
+
+_NUMPY_DTYPES = {float: "float64", int: "int64"}
+
+
+class ColumnBatch:
+    """
+    A batch of records stored as one list per column.
+
+    Rows are only materialized on demand: COPY consumes ``rows()`` tuples
+    directly, executemany gets ``records()``.
+    """
+
+    def __init__(self, columns: t.Dict[str, t.List[t.Any]]):
+        self.columns = columns
+        self.names = list(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def column(self, name: str) -> t.List[t.Any]:
+        return self.columns[name]
+
+    def add_column(self, name: str, values: t.List[t.Any]) -> None:
+        self.columns[name] = values
+        if name not in self.names:
+            self.names.append(name)
+
+    def rows(self, names: t.Optional[t.Sequence[str]] = None) -> t.Iterator[t.Tuple[t.Any, ...]]:
+        """Row tuples in the order of ``names``; columns missing from the batch yield None"""
+        return zip(*(self.columns.get(name, repeat(None)) for name in (names or self.names)))
+
+    def records(self) -> t.List[Row]:
+        names = self.names
+        return [dict(zip(names, row)) for row in self.rows()]
+
+    def take(self, indices: t.Sequence[int]) -> "ColumnBatch":
+        return ColumnBatch({
+            name: [values[index] for index in indices] for name, values in self.columns.items()
+        })
+
+
+def bulk_converter(convert: t.Callable[[t.Any], t.Any]) -> t.Callable[[t.List[t.Any]], t.List[t.Any]]:
+    """
+    Vectorized version of a per-value converter
+
+    float/int conversions run through numpy when it is installed; missing values
+    fall back to the scalar converter so errors match the dict path.
+    """
+    dtype = _NUMPY_DTYPES.get(convert)
+    if np is not None and dtype is not None:
+        def convert_numpy(values: t.List[t.Any]) -> t.List[t.Any]:
+            if None in values:
+                return list(map(convert, values))
+            return np.asarray(values, dtype=dtype).tolist()
+        return convert_numpy
+
+    return lambda values: list(map(convert, values))
+
+
+ColumnarTransform = t.Callable[[t.List[Row]], ColumnBatch]
+
+
+def compile_columnar_transform(fields: FieldMapping) -> ColumnarTransform:
+    """
+    Compile a field mapping into a transform producing a ColumnBatch
+
+    Each flat column is extracted with its own comprehension and converted in
+    bulk; nested mappings (JSON columns) are still built per row.
+    """
+    codegen = TransformCodegen()
+    lines = ["def transform(items):", "    columns = {}"]
+
+    for target, spec in fields.items():
+        if isinstance(spec, dict):
+            expr = f"[{codegen.row(spec)} for item in items]"
+        else:
+            if isinstance(spec, str):
+                spec = Field(spec)
+            expr = f"[{codegen.access(spec)} for item in items]"
+            if spec.convert is not None:
+                expr = f"{codegen.bind('bulk', bulk_converter(spec.convert))}({expr})"
+        lines.append(f"    columns[{target!r}] = {expr}")
+
+    lines.append(f"    return {codegen.bind('batch', ColumnBatch)}(columns)")
+    return codegen.compile("\n".join(lines) + "\n", "transform")
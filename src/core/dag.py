@@ -0,0 +1,166 @@
+import time
+import asyncio
+import logging
+import typing as t
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import EtlSessionLocal
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+NodeFunc = t.Callable[[AsyncSession], t.Awaitable[t.Any]]
+
+
+@dataclass(frozen=True)
+class Node:
+    """
+    A unit of ETL work in the DAG.
+
+    Attributes:
+        name: Unique node name, also used as the run stage name
+        func: Coroutine function run with a dedicated session
+        inputs: Tables the node reads
+        outputs: Tables the node writes
+        pool: Concurrency pool the node belongs to, see Dag.run
+    """
+
+    name: str
+    func: NodeFunc
+    inputs: t.Tuple[str, ...] = ()
+    outputs: t.Tuple[str, ...] = ()
+    pool: t.Optional[str] = None
+
+
+@dataclass
+class NodeResult:
+    """Outcome of a node: its status, return value, wall-clock time and error"""
+
+    name: str
+    status: str
+    value: t.Any = None
+    seconds: float = 0.0
+    error: t.Optional[BaseException] = None
+
+
+class Dag:
+    """
+    Runs nodes concurrently as soon as the nodes producing their inputs are done.
+
+    Inputs that no node produces are treated as already available. Each node
+    gets its own session; if a node fails, every node downstream of it is
+    skipped while independent branches keep running.
+    """
+
+    def __init__(self, nodes: t.Iterable[Node]):
+        self.nodes: t.Dict[str, Node] = {}
+        producers: t.Dict[str, str] = {}
+
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate DAG node '{node.name}'")
+            self.nodes[node.name] = node
+            for output in node.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Table '{output}' is written by both "
+                        f"'{producers[output]}' and '{node.name}'"
+                    )
+                producers[output] = node.name
+
+        self.upstream: t.Dict[str, t.Set[str]] = {
+            name: {producers[table] for table in node.inputs if table in producers} - {name}
+            for name, node in self.nodes.items()
+        }
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> t.List[str]:
+        """
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        remaining = {name: set(upstream) for name, upstream in self.upstream.items()}
+        order = []
+        while remaining:
+            ready = sorted(name for name, upstream in remaining.items() if not upstream)
+            if not ready:
+                raise ValueError(f"DAG has a dependency cycle between {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                for upstream in remaining.values():
+                    upstream.discard(name)
+            order.extend(ready)
+        return order
+
+    async def _run_node(
+            self,
+            node: Node,
+            upstream: t.List["asyncio.Task[NodeResult]"],
+            semaphore: asyncio.Semaphore,
+            pool: t.Optional[asyncio.Semaphore] = None
+    ) -> NodeResult:
+        results = await asyncio.gather(*upstream)
+        blocked = [result.name for result in results if result.status != STATUS_SUCCESS]
+        if blocked:
+            logger.warning(f"Skipping {node.name}: upstream {', '.join(blocked)} did not succeed")
+            return NodeResult(node.name, STATUS_SKIPPED)
+
+        # Wait for the pool before taking a global slot, so queued pool members
+        # do not hold back nodes of other pools
+        if pool is not None:
+            async with pool:
+                return await self._execute(node, semaphore)
+        return await self._execute(node, semaphore)
+
+    @staticmethod
+    async def _execute(node: Node, semaphore: asyncio.Semaphore) -> NodeResult:
+        async with semaphore:
+            started = time.perf_counter()
+            async with EtlSessionLocal() as session:
+                try:
+                    value = await node.func(session)
+                except Exception as e:
+                    await session.rollback()
+                    seconds = time.perf_counter() - started
+                    logger.error(f"{node.name} failed after {seconds:.3f}s: {str(e)}", exc_info=True)
+                    return NodeResult(node.name, STATUS_FAILED, seconds=seconds, error=e)
+
+        seconds = time.perf_counter() - started
+        logger.info(f"{node.name} finished in {seconds:.3f}s")
+        return NodeResult(node.name, STATUS_SUCCESS, value, seconds)
+
+    async def run(
+            self,
+            max_concurrency: t.Optional[int] = None,
+            pool_limits: t.Optional[t.Mapping[str, int]] = None
+    ) -> t.Dict[str, NodeResult]:
+        """
+        Execute every node
+
+        Args:
+            max_concurrency: Nodes allowed to run at once (defaults to ETL_MAX_CONCURRENCY)
+            pool_limits: Nodes of a pool allowed to run at once, on top of
+                max_concurrency; pools without a limit are only bound by it
+
+        Returns:
+            Node results keyed by node name, in topological order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.ETL_MAX_CONCURRENCY)
+        pools = {name: asyncio.Semaphore(limit) for name, limit in (pool_limits or {}).items()}
+        tasks: t.Dict[str, "asyncio.Task[NodeResult]"] = {}
+        for name in self.order:
+            node = self.nodes[name]
+            upstream = [tasks[dependency] for dependency in sorted(self.upstream[name])]
+            tasks[name] = asyncio.ensure_future(
+                self._run_node(node, upstream, semaphore, pools.get(node.pool))
+            )
+
+        await asyncio.gather(*tasks.values())
+        return {name: task.result() for name, task in tasks.items()}
@@ -1,85 +1,567 @@
-import httpx
+import time
 import json
+import hashlib
 import logging
 
 import typing as t
+from functools import lru_cache
+from operator import itemgetter
+from psycopg import sql
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy import ColumnElement, Table, column, or_, select, table as table_clause, text
 
+from src.config.settings import settings
+from src.core.columnar import ColumnBatch
+from src.core.exception import ExtractionError
+from src.core.http_client import get_http_client
+from src.core.utils import json_codec
+from src.core.rejects import STAGE_VALIDATE, RejectRow, reject_row, write_rejects
+from src.core.validation import RecordValidator, Reject
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
 
+LOAD_MODE_UPSERT = 'upsert'
+LOAD_MODE_COPY = 'copy'
+LOAD_MODES = (LOAD_MODE_UPSERT, LOAD_MODE_COPY)
+
+Batch = t.Union[t.List[t.Dict[str, t.Any]], ColumnBatch]
+
+
+def _changed_rows(table: Table, stmt: Insert) -> t.Optional[ColumnElement[bool]]:
+    """
+    ON CONFLICT condition skipping rows whose content hash did not change
+
+    Unchanged rows are then not rewritten, so they neither bloat the table nor
+    fire its UPDATE triggers. Rows sent without a hash are always updated.
+    """
+    if "content_hash" not in table.c:
+        return None
+    incoming = stmt.excluded.content_hash
+    return or_(incoming.is_(None), table.c.content_hash.is_distinct_from(incoming))
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(
+        table: Table,
+        conflict_index: str,
+        exclude_fields: t.FrozenSet[str]
+) -> Insert:
+    """Build the INSERT ... ON CONFLICT DO UPDATE statement once per table/conflict setup"""
+    stmt = insert(table)
+    update_mapping = {
+        col.name: getattr(stmt.excluded, col.name)
+        for col in table.columns
+        if col.name != conflict_index and col.name not in exclude_fields
+    }
+    return stmt.on_conflict_do_update(
+        index_elements=[conflict_index],
+        set_=update_mapping,
+        where=_changed_rows(table, stmt)
+    )
+
+
+# Identity column of the staging table recording the COPY order of the rows
+STAGING_SEQUENCE = "_staging_seq"
+
+
+def _staging_name(table: Table) -> str:
+    return f"{table.name}_staging"
+
+
+@lru_cache(maxsize=None)
+def _merge_statement(
+        table: Table,
+        conflict_index: str,
+        exclude_fields: t.FrozenSet[str]
+) -> Insert:
+    """
+    Build the set-based INSERT ... SELECT ... ON CONFLICT merge from the staging table
+
+    Of rows sharing a conflict key the last one copied wins, as it would with
+    sequential upserts.
+    """
+    columns = [col.name for col in table.columns]
+    staging = table_clause(
+        _staging_name(table), *[column(name) for name in (*columns, STAGING_SEQUENCE)]
+    )
+    source = (
+        select(*[staging.c[name] for name in columns])
+        .distinct(staging.c[conflict_index])
+        .order_by(staging.c[conflict_index], staging.c[STAGING_SEQUENCE].desc())
+    )
+
+    stmt = insert(table).from_select(columns, source)
+    update_mapping = {
+        col.name: getattr(stmt.excluded, col.name)
+        for col in table.columns
+        if col.name != conflict_index and col.name not in exclude_fields
+    }
+    return stmt.on_conflict_do_update(
+        index_elements=[conflict_index],
+        set_=update_mapping,
+        where=_changed_rows(table, stmt)
+    )
+
+
+_hash_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _values_hash(values: t.Sequence[t.Any]) -> str:
+    """Digest of a record's values listed in sorted column-name order"""
+    payload = _hash_encoder.encode(values)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def content_hash(row: t.Dict[str, t.Any]) -> str:
+    """Stable digest of a transformed record, independent of key order"""
+    return _values_hash([row[name] for name in sorted(row)])
+
+
+def _copy_value(value: t.Any) -> t.Any:
+    """Adapt JSON-typed values for COPY, which has no dumper for dicts and lists"""
+    if isinstance(value, (dict, list)):
+        return json_codec.dumps(value)
+    return value
+
 
 class BaseDataLoader:
     """Base class for data loading operations"""
 
-    def __init__(self, api_url: str):
+    def __init__(
+            self,
+            api_url: str,
+            load_mode: t.Optional[str] = None,
+            incremental: t.Optional[bool] = None
+    ):
         self.api_url = api_url
         self.data_key = 'items'
+        self.table: t.Optional[Table] = None
+        self.conflict_index = 'id'
+        self.exclude_fields: t.List[str] = []
+        self.validator: t.Optional[RecordValidator] = None
+        self.run_id: t.Optional[str] = None
+        self.pending_rejects: t.List[RejectRow] = []
+        self.load_mode = load_mode or settings.ETL_LOAD_MODE
+        self.incremental = settings.ETL_INCREMENTAL if incremental is None else incremental
+        self.stats = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0}
+        self.changed_ids: t.Set[t.Any] = set()
+        self.timings = {"extract": 0.0, "validate": 0.0, "transform": 0.0, "upsert": 0.0}
+        self.bytes_fetched = 0
+
+        if self.load_mode not in LOAD_MODES:
+            raise ValueError(
+                f"Unknown load mode '{self.load_mode}', expected one of {LOAD_MODES}"
+            )
+
+    @property
+    def name(self) -> str:
+        """Source name used in run statistics and metrics"""
+        return self.data_key
 
     async def fetch_data(self) -> t.List[t.Dict[str, t.Any]]:
-        """Fetch data from API endpoint"""
+        """
+        Fetch data from API endpoint
+
+        Raises:
+            ExtractionError: If the request fails after retries or the body is not valid JSON
+        """
+        response = await get_http_client().get(self.api_url)
+        self.bytes_fetched += len(response.content)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.api_url)
-                response.raise_for_status()
-                data = response.json()
-                return data.get(self.data_key, [])
-        except httpx.HTTPError as e:
-            logger.error(f"API request failed: {str(e)}")
-            return []
-        except json.JSONDecodeError as e:
+            data = json_codec.loads(response.content)
+        except json_codec.DecodeError as e:
             logger.error(f"Invalid JSON response: {str(e)}")
-            return []
+            raise ExtractionError(f"Invalid JSON response from {self.api_url}") from e
+        return data.get(self.data_key, [])
+
+    async def fetch_batches(
+            self,
+            page_size: t.Optional[int] = None
+    ) -> t.AsyncIterator[t.List[t.Dict[str, t.Any]]]:
+        """
+        Fetch data page by page following the API's page/limit parameters
+
+        Args:
+            page_size: Number of records requested per page (defaults to ETL_PAGE_SIZE)
+
+        Yields:
+            Lists of raw records, one per non-empty page
+
+        Raises:
+            ExtractionError: If a page cannot be fetched after retries or is not valid JSON
+        """
+        page_size = page_size or settings.ETL_PAGE_SIZE
+        client = get_http_client()
+        page = 1
+        previous_ids = None
+
+        while True:
+            response = await client.get(
+                self.api_url, params={"page": page, "limit": page_size}
+            )
+            self.bytes_fetched += len(response.content)
+            try:
+                batch = json_codec.loads(response.content).get(self.data_key, [])
+            except json_codec.DecodeError as e:
+                logger.error(f"Invalid JSON response on page {page}: {str(e)}")
+                raise ExtractionError(
+                    f"Invalid JSON response from {self.api_url} on page {page}"
+                ) from e
+
+            if not batch:
+                return
+
+            # Endpoints without pagination support keep returning the same page
+            ids = [item.get('id') for item in batch]
+            if ids == previous_ids:
+                return
+
+            yield batch
+
+            if len(batch) < page_size:
+                return
+
+            previous_ids = ids
+            page += 1
+
+    def validate_records(
+            self,
+            raw_data: t.List[t.Dict[str, t.Any]]
+    ) -> t.Tuple[t.List[t.Dict[str, t.Any]], t.List[Reject]]:
+        """Validate a page against the source schema, splitting off invalid records"""
+        if self.validator is None:
+            return raw_data, []
+        return self.validator.validate(raw_data)
+
+    def reject(self, stage: str, rejects: t.List[Reject]) -> None:
+        """Queue rejected records for the dead-letter table, see flush_rejects"""
+        self.pending_rejects.extend(
+            reject_row(self.name, stage, reject, self.run_id) for reject in rejects
+        )
+        self.stats["rejected"] += len(rejects)
+
+    async def flush_rejects(self, db_session: AsyncSession) -> None:
+        """Write the rejects queued for the current batch to etl_rejects and commit"""
+        if not self.pending_rejects:
+            return
+        await write_rejects(db_session, self.pending_rejects)
+        await db_session.commit()
+        self.pending_rejects = []
 
     async def transform_data(self, raw_data: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
         """Transform API data to database format"""
         raise NotImplementedError("Subclasses must implement this method")
 
+    @staticmethod
+    def add_content_hashes(rows: Batch) -> Batch:
+        """
+        Store the content hash of every transformed row under ``content_hash``
+
+        Column batches are hashed straight from their row tuples; both shapes
+        digest the same values in sorted column-name order, so the hashes agree.
+        """
+        if isinstance(rows, ColumnBatch):
+            rows.add_column(
+                "content_hash", [_values_hash(values) for values in rows.rows(sorted(rows.names))]
+            )
+            return rows
+
+        if not rows:
+            return rows
+        # Compiled transforms give every row of a page the same keys
+        names = sorted(rows[0])
+        values = itemgetter(*names) if len(names) > 1 else lambda row: (row[names[0]],)
+        for row in rows:
+            row["content_hash"] = _values_hash(values(row))
+        return rows
+
+    async def classify_changes(
+            self,
+            db_session: AsyncSession,
+            table: Table,
+            data: Batch,
+            conflict_index: str = 'id'
+    ) -> Batch:
+        """
+        Compare rows against the stored content hashes and update the run statistics
+
+        Args:
+            db_session: Database session
+            table: SQLAlchemy table object with a ``content_hash`` column
+            data: Transformed rows carrying ``content_hash``
+            conflict_index: Column identifying a record
+
+        Returns:
+            Rows that have to be written: new and changed ones in incremental mode,
+            all rows otherwise
+        """
+        if not len(data):
+            return data
+
+        if isinstance(data, ColumnBatch):
+            ids = data.column(conflict_index)
+            hashes = data.column("content_hash")
+        else:
+            ids = [row[conflict_index] for row in data]
+            hashes = [row["content_hash"] for row in data]
+
+        key = table.c[conflict_index]
+        result = await db_session.execute(
+            select(key, table.c.content_hash).where(key.in_(ids))
+        )
+        stored = dict(result.all())
+
+        changed = []
+        for index, (row_id, row_hash) in enumerate(zip(ids, hashes)):
+            if row_id not in stored:
+                self.stats["inserted"] += 1
+            elif stored[row_id] != row_hash:
+                self.stats["updated"] += 1
+            else:
+                self.stats["unchanged"] += 1
+                continue
+            self.changed_ids.add(row_id)
+            changed.append(index)
+
+        if not self.incremental or len(changed) == len(ids):
+            return data
+        if isinstance(data, ColumnBatch):
+            return data.take(changed)
+        return [data[index] for index in changed]
+
     async def upsert_data(
             self,
             db_session: AsyncSession,
             table: Table,
-            data: t.List[t.Dict[str, t.Any]],
+            data: Batch,
             conflict_index: str = 'id',
-            exclude_fields: t.List[str] = None
+            exclude_fields: t.List[str] = None,
+            batch_size: t.Optional[int] = None
     ) -> int:
         """
         Perform bulk upsert operation (insert or update on conflict)
 
+        Rows are sent in chunks of ``batch_size`` through a cached statement executed
+        with executemany semantics, which keeps every statement well below the
+        PostgreSQL bind-parameter limit regardless of the input size.
+
         Args:
             db_session: Database session
             table: SQLAlchemy table object
-            data: List of dictionaries with data
+            data: Rows as dictionaries or a ColumnBatch
             conflict_index: Column name for conflict resolution
             exclude_fields: Fields to exclude from updates
+            batch_size: Rows per chunk (defaults to ETL_UPSERT_BATCH_SIZE)
 
         Returns:
             Number of affected rows
         """
-        if not data:
+        if not len(data):
             logger.warning(f"No {self.data_key} received from API")
             return 0
 
-        if exclude_fields is None:
-            exclude_fields = []
-
-        update_mapping = {
-            col.name: getattr(insert(table).excluded, col.name)
-            for col in table.columns
-            if col.name != conflict_index and col.name not in exclude_fields
-        }
+        if isinstance(data, ColumnBatch):
+            data = data.records()
 
-        stmt = insert(table).values(data)
-        upsert_stmt = stmt.on_conflict_do_update(
-            index_elements=[conflict_index],
-            set_=update_mapping
+        batch_size = batch_size or settings.ETL_UPSERT_BATCH_SIZE
+        upsert_stmt = _upsert_statement(
+            table, conflict_index, frozenset(exclude_fields or ())
         )
 
-        result = await db_session.execute(upsert_stmt)
+        total = 0
+        for offset in range(0, len(data), batch_size):
+            chunk = data[offset:offset + batch_size]
+            started = time.perf_counter()
+            await db_session.execute(upsert_stmt, chunk)
+            total += len(chunk)
+            logger.info(
+                f"Upserted chunk {offset // batch_size + 1}: {len(chunk)} {self.data_key} "
+                f"in {time.perf_counter() - started:.3f}s"
+            )
+
         await db_session.commit()
-        logger.info(f"Successfully upserted {len(data)} {self.data_key}")
+        logger.info(f"Successfully upserted {total} {self.data_key}")
+        return total
+
+    async def prepare_staging(self, db_session: AsyncSession, table: Table) -> None:
+        """
+        Recreate the unlogged staging table mirroring ``table``
+
+        It is rebuilt for every load so it always follows the current schema
+        of ``table``, plus an identity column recording the COPY order.
+        """
+        staging = _staging_name(table)
+        await db_session.execute(text(f'DROP TABLE IF EXISTS "{staging}"'))
+        await db_session.execute(text(
+            f'CREATE UNLOGGED TABLE "{staging}" (LIKE "{table.name}" INCLUDING DEFAULTS, '
+            f'"{STAGING_SEQUENCE}" bigint GENERATED ALWAYS AS IDENTITY)'
+        ))
+
+    async def copy_to_staging(
+            self,
+            db_session: AsyncSession,
+            table: Table,
+            data: Batch
+    ) -> int:
+        """
+        Stream rows into the staging table with COPY FROM STDIN
+
+        Args:
+            db_session: Database session (its psycopg connection is used for COPY)
+            table: SQLAlchemy table object the staging table mirrors
+            data: Rows as dictionaries or a ColumnBatch
+
+        Returns:
+            Number of copied rows
+        """
+        if not len(data):
+            return 0
+
+        columns = [col.name for col in table.columns]
+        if isinstance(data, ColumnBatch):
+            rows = data.rows(columns)
+        else:
+            rows = ([row.get(name) for name in columns] for row in data)
+        copy_stmt = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(_staging_name(table)),
+            sql.SQL(", ").join(sql.Identifier(name) for name in columns),
+        )
+
+        connection = await db_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        started = time.perf_counter()
+
+        async with raw_connection.driver_connection.cursor() as cursor:
+            async with cursor.copy(copy_stmt) as copy:
+                for row in rows:
+                    await copy.write_row([_copy_value(value) for value in row])
+
+        logger.info(
+            f"Copied {len(data)} {self.data_key} to staging "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
         return len(data)
 
+    async def merge_staging(
+            self,
+            db_session: AsyncSession,
+            table: Table,
+            conflict_index: str = 'id',
+            exclude_fields: t.List[str] = None
+    ) -> int:
+        """
+        Merge the staging table into ``table`` with one INSERT ... SELECT ... ON CONFLICT
+
+        Returns:
+            Number of affected rows
+        """
+        merge_stmt = _merge_statement(
+            table, conflict_index, frozenset(exclude_fields or ())
+        )
+
+        started = time.perf_counter()
+        result = await db_session.execute(merge_stmt)
+        await db_session.execute(text(f'DROP TABLE "{_staging_name(table)}"'))
+        await db_session.commit()
+
+        logger.info(
+            f"Merged {result.rowcount} {self.data_key} from staging "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        return result.rowcount
+
+    async def copy_data(
+            self,
+            db_session: AsyncSession,
+            table: Table,
+            data: Batch,
+            conflict_index: str = 'id',
+            exclude_fields: t.List[str] = None
+    ) -> int:
+        """
+        Full-refresh counterpart of upsert_data: COPY into staging, then merge
+
+        Returns:
+            Number of affected rows
+        """
+        if not len(data):
+            logger.warning(f"No {self.data_key} received from API")
+            return 0
+
+        await self.prepare_staging(db_session, table)
+        await self.copy_to_staging(db_session, table, data)
+        return await self.merge_staging(db_session, table, conflict_index, exclude_fields)
+
+    async def load(self, db_session: AsyncSession) -> int:
+        """
+        Stream pages from the API, transforming and loading each one separately,
+        so only a single page is held in memory at a time
+
+        In ``copy`` mode every page is appended to the staging table and the
+        whole load is merged into the target table once at the end. In
+        incremental mode rows whose content hash is unchanged are skipped.
+        Records rejected by validation or the transform are written to
+        etl_rejects at the end of their batch instead of failing the load.
+
+        Args:
+            db_session: Database session
+
+        Returns:
+            Number of affected rows
+        """
+        if self.table is None:
+            raise NotImplementedError("Subclasses must set the target table")
+
+        copy_mode = self.load_mode == LOAD_MODE_COPY
+        if copy_mode:
+            await self.prepare_staging(db_session, self.table)
+
+        total = 0
+        batches = self.fetch_batches().__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                raw_batch = await batches.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                self.timings["extract"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            raw_batch, rejects = self.validate_records(raw_batch)
+            self.reject(STAGE_VALIDATE, rejects)
+            self.timings["validate"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            batch = await self.transform_data(raw_batch)
+            self.timings["transform"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            batch = await self.classify_changes(
+                db_session, self.table, batch, self.conflict_index
+            )
+            if batch:
+                if copy_mode:
+                    total += await self.copy_to_staging(db_session, self.table, batch)
+                else:
+                    total += await self.upsert_data(
+                        db_session, self.table, batch, self.conflict_index, self.exclude_fields
+                    )
+            await self.flush_rejects(db_session)
+            self.timings["upsert"] += time.perf_counter() - started
+
+        if copy_mode:
+            started = time.perf_counter()
+            total = await self.merge_staging(
+                db_session, self.table, self.conflict_index, self.exclude_fields
+            )
+            self.timings["upsert"] += time.perf_counter() - started
+
+        logger.info(
+            f"Loaded {total} {self.data_key} in total "
+            f"(inserted: {self.stats['inserted']}, updated: {self.stats['updated']}, "
+            f"unchanged: {self.stats['unchanged']}, rejected: {self.stats['rejected']})"
+        )
+        return total
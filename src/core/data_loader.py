@@ -1,87 +1,187 @@
-import json
 import logging
 import typing as t
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.settings import settings
-from src.core.data_extraction import BaseDataLoader
+from src.core.dag import Node
+from src.core.data_extraction import Batch, BaseDataLoader
+from src.core.etl_run import EtlRun
+from src.core.metrics import ETL_ROWS, ETL_ROWS_PER_SECOND
+from src.core.models.scheme import Product, User
+from src.core.rejects import STAGE_TRANSFORM, error_details
+from src.core.sources import SOURCES, SourceSpec, register_source
+from src.core.transform_codegen import Field
+from src.core.utils import json_codec
+from src.core.validation import Reject
 from src.db.table import ProductDB, UserDB
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
 
 
-class ProductDataLoader(BaseDataLoader):
+def _parse_json(value: t.Any) -> t.Any:
+    return json_codec.loads(value) if isinstance(value, str) else value
+
+
+register_source(SourceSpec(
+    name="products",
+    endpoint=settings.API_PRODUCTS,
+    data_key="products",
+    table=ProductDB.__table__,
+    fields={
+        "id": "id",
+        "title": "title",
+        "image": "image",
+        "price": Field("price", float),
+        "description": "description",
+        "brand": "brand",
+        "model": "model",
+        "color": Field("color", default=None),
+        "category": "category",
+        "discount": Field("discount", default=None),
+        "popular": Field("popular", default=False),
+        "on_sale": Field("onSale", default=False),
+    },
+    schema=Product,
+))
+
+register_source(SourceSpec(
+    name="users",
+    endpoint=settings.API_USERS,
+    data_key="users",
+    table=UserDB.__table__,
+    fields={
+        "id": "id",
+        "email": "email",
+        "username": "username",
+        "password": "password",
+        "name": {
+            "firstname": "name.firstname",
+            "lastname": "name.lastname",
+        },
+        "address": Field("address", _parse_json),
+        "phone": "phone",
+    },
+    schema=User,
+))
+
+
+class SourceDataLoader(BaseDataLoader):
+    """Data loader driven by a registered SourceSpec"""
+
+    def __init__(
+            self,
+            spec: SourceSpec,
+            load_mode: t.Optional[str] = None,
+            incremental: t.Optional[bool] = None,
+            columnar: t.Optional[bool] = None,
+            run_id: t.Optional[str] = None
+    ):
+        super().__init__(spec.endpoint, load_mode or spec.load_mode, incremental)
+        self.spec = spec
+        self.run_id = run_id
+        self.validator = spec.validator if settings.ETL_VALIDATE else None
+        self.columnar = settings.ETL_COLUMNAR if columnar is None else columnar
+        self.data_key = spec.data_key
+        self.table = spec.table
+        self.conflict_index = spec.conflict_key
+        self.exclude_fields = list(spec.exclude_fields)
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    def transform_records(
+            self,
+            raw_data: t.List[t.Dict[str, t.Any]]
+    ) -> t.Tuple[Batch, t.List[Reject]]:
+        """
+        Run the compiled field mapping over a batch, isolating records it fails on
+
+        The whole batch is transformed in one call; only if that raises is each
+        record tried on its own to find the offending ones, and the batch is
+        transformed again without them.
+
+        Returns:
+            Rows (a list of dicts, or a ColumnBatch in columnar mode) and rejects
+        """
+        transform = self.spec.columnar_transform if self.columnar else self.spec.transform
+        try:
+            return transform(raw_data), []
+        except Exception:
+            pass
+
+        rejects = []
+        for index, record in enumerate(raw_data):
+            try:
+                self.spec.transform([record])
+            except Exception as e:
+                rejects.append(Reject(index, record, error_details(e)))
+
+        rejected = {reject.index for reject in rejects}
+        valid = [record for index, record in enumerate(raw_data) if index not in rejected]
+        logger.warning(f"{len(rejects)} of {len(raw_data)} {self.name} records failed to transform")
+        return transform(valid), rejects
+
+    async def transform_data(self, raw_data: t.List[t.Dict[str, t.Any]]) -> Batch:
+        """
+        Transform API data with the source's compiled field mapping
+
+        Returns a list of row dicts, or a ColumnBatch in columnar mode
+        """
+        rows, rejects = self.transform_records(raw_data)
+        self.reject(STAGE_TRANSFORM, rejects)
+        return self.add_content_hashes(rows)
+
+
+class ProductDataLoader(SourceDataLoader):
     """Data loader for product information"""
 
-    def __init__(self):
-        super().__init__(settings.API_PRODUCTS)
-        self.data_key = 'products'
-
-    async def transform_data(self, raw_data: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
-        """Transform product data to database format"""
-        return [
-            {
-                "id": item['id'],
-                "title": item['title'],
-                "image": item['image'],
-                "price": float(item['price']),
-                "description": item['description'],
-                "brand": item['brand'],
-                "model": item['model'],
-                "color": item.get('color'),
-                "category": item['category'],
-                "discount": item.get('discount'),
-                "popular": item.get('popular', False),
-                "on_sale": item.get('onSale', False),
-            }
-            for item in raw_data
-        ]
-
-
-class UserDataLoader(BaseDataLoader):
+    def __init__(self, load_mode: t.Optional[str] = None, incremental: t.Optional[bool] = None):
+        super().__init__(SOURCES["products"], load_mode, incremental)
+
+
+class UserDataLoader(SourceDataLoader):
     """Data loader for user information"""
 
-    def __init__(self):
-        super().__init__(settings.API_USERS)
-        self.data_key = 'users'
-
-    async def transform_data(self, raw_data: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
-        """Transform user data to database format"""
-        return [
-            {
-                "id": item['id'],
-                "email": item['email'],
-                "username": item['username'],
-                "password": item['password'],
-                "name": {
-                    "firstname": item['name']['firstname'],
-                    "lastname": item['name']['lastname']
-                },
-                "address": json.loads(item['address']) if isinstance(item['address'], str) else item['address'],
-                "phone": item['phone'],
-            }
-            for item in raw_data
-        ]
-
-
-async def load_all_data(db_session: AsyncSession) -> bool:
-    """Main data loading function that handles both products and users"""
-    try:
-        product_loader = ProductDataLoader()
-        user_loader = UserDataLoader()
-
-        raw_products = await product_loader.fetch_data()
-        products = await product_loader.transform_data(raw_products)
-        await product_loader.upsert_data(db_session, ProductDB.__table__, products)
-
-        raw_users = await user_loader.fetch_data()
-        users = await user_loader.transform_data(raw_users)
-        await user_loader.upsert_data(db_session, UserDB.__table__, users)
-
-        return True
-
-    except Exception as e:
-        await db_session.rollback()
-        logger.error(f"Data loading failed: {str(e)}", exc_info=True)
-        return False
+    def __init__(self, load_mode: t.Optional[str] = None, incremental: t.Optional[bool] = None):
+        super().__init__(SOURCES["users"], load_mode, incremental)
+
+
+LOAD_PREFIX = "load."
+LOAD_POOL = "load"
+
+
+def load_nodes(run: t.Optional[EtlRun] = None) -> t.List[Node]:
+    """DAG nodes loading every registered source into its table"""
+
+    def node(spec: SourceSpec) -> Node:
+        async def load(db_session: AsyncSession) -> int:
+            loader = SourceDataLoader(spec, run_id=run.run_id if run is not None else None)
+            try:
+                return await loader.load(db_session)
+            finally:
+                _record_loader_metrics(loader, run)
+
+        return Node(f"{LOAD_PREFIX}{spec.name}", load, outputs=(spec.table.name,), pool=LOAD_POOL)
+
+    return [node(spec) for spec in SOURCES.values()]
+
+
+def _record_loader_metrics(loader: BaseDataLoader, run: t.Optional[EtlRun]) -> None:
+    """Publish a loader's counters and timings to the metrics and the run state"""
+    source = loader.name
+    rows = sum(loader.stats.values())
+    elapsed = sum(loader.timings.values())
+
+    for status, count in loader.stats.items():
+        ETL_ROWS.inc(count, source=source, status=status)
+    if elapsed:
+        ETL_ROWS_PER_SECOND.set(rows / elapsed, source=source)
+
+    if run is not None:
+        run.stats[source] = dict(loader.stats)
+        run.changed_ids[source] = set(loader.changed_ids)
+        run.bytes_fetched[source] = loader.bytes_fetched
+        for stage, seconds in loader.timings.items():
+            run.record_stage(f"{source}.{stage}", seconds)
@@ -1,15 +1,28 @@
+import re
+import time
 import logging
-from typing import Dict
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import Integer, TextClause, any_, bindparam, delete, exists, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.settings import settings
+from src.core.dag import STATUS_SKIPPED, Node, NodeResult
+from src.core.etl_run import EtlRun
+from src.core.marts import MART_BACKEND_MATVIEW, MART_BACKENDS, materialized_view_nodes
+from src.core.metrics import ETL_STAGE_DURATION
+from src.core.rejects import STAGE_TRANSFORM, error_details, reject_row, write_rejects
+from src.core.shadow import prepare_shadow, swap_shadow
+from src.core.validation import Reject
+
 from src.core.exception import (
     MostExpensiveTransformationError,
     OdsUsersTransformationError,
+    SalesAggregatesTransformationError,
     UserProcessingError,
 )
 from src.db.table import ProductDB, UserDB
-from src.db.table import MostExpensive, OdsUser
+from src.db.table import MostExpensive, OdsUser, SalesAggregate
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
@@ -18,10 +31,28 @@ logger.propagate = False
 class MostExpensiveTransformer:
     """Transforms product data to identify and store the most expensive products."""
 
+    inputs = ("products",)
+    outputs = ("most_expensive",)
+
     @staticmethod
-    async def transform(db_session: AsyncSession) -> int:
+    async def transform(
+        db_session: AsyncSession,
+        limit: Optional[int] = None,
+        shadow: Optional[bool] = None,
+    ) -> int:
         """
-        Extracts, transforms and loads the 10 most expensive products.
+        Extracts, transforms and loads the most expensive products.
+
+        The table is cleared and refilled by one INSERT ... SELECT with the
+        DELETE attached as a CTE, so readers never observe an empty table.
+        In shadow mode the rows go into a fresh most_expensive_next table that
+        is renamed over the live one instead, leaving no dead tuples behind.
+
+        Args:
+            db_session: Database session
+            limit: Number of products to keep (defaults to MOST_EXPENSIVE_LIMIT)
+            shadow: Build into a shadow table and swap it in
+                (defaults to MART_SHADOW_BUILD)
 
         Returns:
             int: Number of successfully processed products
@@ -29,50 +60,45 @@ class MostExpensiveTransformer:
         Raises:
             MostExpensiveTransformationError: If any step of the transformation fails
         """
+        limit = limit or settings.MOST_EXPENSIVE_LIMIT
+        if shadow is None:
+            shadow = settings.MART_SHADOW_BUILD
+        started = time.perf_counter()
+
         try:
-            try:
-                await db_session.execute(MostExpensive.__table__.delete())
-            except Exception as e:
-                raise MostExpensiveTransformationError(
-                    f"Failed to clear MostExpensive table: {str(e)}"
-                ) from e
+            top_products = (
+                select(ProductDB.title, ProductDB.price, ProductDB.category)
+                .order_by(ProductDB.price.desc())
+                .limit(limit)
+            )
+            columns = ["product_name", "price", "category"]
 
             try:
-                stmt = (
-                    select(
-                        ProductDB.title.label("product_name"),
-                        ProductDB.price,
-                        ProductDB.category,
+                if shadow:
+                    target = await prepare_shadow(db_session, MostExpensive.__table__)
+                    result = await db_session.execute(
+                        insert(target).from_select(columns, top_products)
                     )
-                    .order_by(ProductDB.price.desc())
-                    .limit(10)
-                )
-
-                result = await db_session.execute(stmt)
-                products = result.mappings().all()
-            except Exception as e:
-                raise MostExpensiveTransformationError(
-                    f"Failed to fetch most expensive products: {str(e)}"
-                ) from e
-
-            try:
-                for product in products:
-                    db_session.add(
-                        MostExpensive(
-                            product_name=product["product_name"],
-                            price=product["price"],
-                            category=product["category"],
-                        )
+                    await swap_shadow(db_session, MostExpensive.__table__)
+                else:
+                    result = await db_session.execute(
+                        insert(MostExpensive)
+                        .from_select(columns, top_products)
+                        .add_cte(delete(MostExpensive).cte("cleared"))
                     )
-
                 await db_session.commit()
-                return len(products)
             except Exception as e:
                 await db_session.rollback()
                 raise MostExpensiveTransformationError(
-                    f"Failed to insert most expensive products: {str(e)}"
+                    f"Failed to refresh most expensive products: {str(e)}"
                 ) from e
 
+            logger.info(
+                f"Refreshed most_expensive with {result.rowcount} products "
+                f"in {time.perf_counter() - started:.3f}s"
+            )
+            return result.rowcount
+
         except MostExpensiveTransformationError:
             raise
         except Exception as e:
@@ -82,36 +108,344 @@ class MostExpensiveTransformer:
             ) from e
 
 
+SALES_DIMENSIONS = ("category", "brand")
+
+# Upper bounds of the discount buckets reported in discount_distribution
+DISCOUNT_BUCKETS = ((10, "1-10"), (25, "11-25"), (50, "26-50"))
+
+_CLAIM_DIRTY_SALES_GROUPS_SQL = text(
+    "DELETE FROM sales_aggregates_dirty RETURNING dimension, key"
+)
+
+
+def _discount_distribution_sql() -> str:
+    buckets = ["'none', count(*) FILTER (WHERE COALESCE(p.discount, 0) <= 0)"]
+    lower = 1
+    for upper, label in DISCOUNT_BUCKETS:
+        buckets.append(
+            f"'{label}', count(*) FILTER (WHERE p.discount BETWEEN {lower} AND {upper})"
+        )
+        lower = upper + 1
+    buckets.append(f"'{lower}+', count(*) FILTER (WHERE p.discount >= {lower})")
+    return f"jsonb_build_object({', '.join(buckets)})"
+
+
+def _sales_group_select(dimension: str) -> str:
+    return f"""
+    SELECT
+        '{dimension}',
+        COALESCE(p.{dimension}, ''),
+        count(*),
+        min(p.price),
+        avg(p.price),
+        max(p.price),
+        count(*) FILTER (WHERE p.discount > 0),
+        avg(p.discount) FILTER (WHERE p.discount > 0),
+        {_discount_distribution_sql()},
+        count(*) FILTER (WHERE p.on_sale),
+        count(*) FILTER (WHERE p.on_sale)::float / count(*),
+        now()
+    FROM products p
+    WHERE COALESCE(p.{dimension}, '') = ANY(CAST(:{dimension}_keys AS text[]))
+    GROUP BY COALESCE(p.{dimension}, '')
+"""
+
+
+SALES_AGGREGATE_COLUMNS = (
+    "dimension", "key", "product_count", "min_price", "avg_price", "max_price",
+    "discounted_count", "avg_discount", "discount_distribution",
+    "on_sale_count", "on_sale_share", "updated_at",
+)
+
+SALES_AGGREGATES_UPSERT_SQL = text(
+    f"INSERT INTO sales_aggregates ({', '.join(SALES_AGGREGATE_COLUMNS)})"
+    + "\n    UNION ALL\n".join(_sales_group_select(dimension) for dimension in SALES_DIMENSIONS)
+    + "ON CONFLICT (dimension, key) DO UPDATE SET "
+    + ", ".join(f"{name} = EXCLUDED.{name}" for name in SALES_AGGREGATE_COLUMNS[2:])
+    + " RETURNING dimension, key"
+)
+
+
+class SalesAggregatesTransformer:
+    """
+    Maintains sales_aggregates, the per-category and per-brand product statistics.
+
+    Triggers on products record every category and brand touched by an
+    insert, update or delete in sales_aggregates_dirty; only those groups are
+    recomputed, so the cost follows the size of the change, not of products.
+    """
+
+    inputs = ("products",)
+    outputs = ("sales_aggregates",)
+
+    @staticmethod
+    async def transform(db_session: AsyncSession) -> int:
+        """
+        Recomputes the aggregates of every group changed since the last refresh.
+
+        Returns:
+            int: Number of refreshed groups
+
+        Raises:
+            SalesAggregatesTransformationError: If the refresh fails
+        """
+        started = time.perf_counter()
+        try:
+            result = await db_session.execute(_CLAIM_DIRTY_SALES_GROUPS_SQL)
+            dirty = {(dimension, key) for dimension, key in result.all()}
+            if not dirty:
+                await db_session.commit()
+                return 0
+
+            params = {
+                f"{dimension}_keys": sorted(key for group_dimension, key in dirty
+                                            if group_dimension == dimension)
+                for dimension in SALES_DIMENSIONS
+            }
+            result = await db_session.execute(SALES_AGGREGATES_UPSERT_SQL, params)
+            refreshed = {(dimension, key) for dimension, key in result.all()}
+
+            # Groups that no longer have any product
+            emptied = dirty - refreshed
+            for dimension in SALES_DIMENSIONS:
+                keys = [key for group_dimension, key in emptied if group_dimension == dimension]
+                if keys:
+                    await db_session.execute(
+                        delete(SalesAggregate).where(
+                            SalesAggregate.dimension == dimension,
+                            SalesAggregate.key.in_(keys),
+                        )
+                    )
+            await db_session.commit()
+        except Exception as e:
+            await db_session.rollback()
+            raise SalesAggregatesTransformationError(
+                f"Failed to refresh sales aggregates: {str(e)}"
+            ) from e
+
+        logger.info(
+            f"Refreshed {len(refreshed)} sales aggregate groups, removed {len(emptied)} "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        return len(refreshed)
+
+
+ODS_USERS_COLUMNS = (
+    "user_id", "firstname", "lastname", "lat", "long",
+    "street_number", "street", "zipcode", "city",
+)
+
+# Numbers PostgreSQL's float cast accepts; the Python path applies the same check.
+# JSON null is treated like a missing key on both paths: '' for text, 0.0 for coordinates.
+_JSON_NUMBER_PATTERN = r"^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$"
+_JSON_NUMBER = re.compile(_JSON_NUMBER_PATTERN)
+
+_ODS_USERS_SELECT = f"""
+    SELECT
+        u.id,
+        COALESCE(u.name::jsonb ->> 'firstname', ''),
+        COALESCE(u.name::jsonb ->> 'lastname', ''),
+        COALESCE((u.address::jsonb -> 'geolocation' ->> 'lat')::float, 0.0),
+        COALESCE((u.address::jsonb -> 'geolocation' ->> 'long')::float, 0.0),
+        COALESCE(u.address::jsonb ->> 'number', ''),
+        COALESCE(u.address::jsonb ->> 'street', ''),
+        COALESCE(u.address::jsonb ->> 'zipcode', ''),
+        COALESCE(u.address::jsonb ->> 'city', '')
+    FROM users u
+    WHERE jsonb_typeof(u.name::jsonb) = 'object'
+      AND jsonb_typeof(u.address::jsonb) = 'object'
+      AND jsonb_typeof(COALESCE(u.address::jsonb -> 'geolocation', 'null'::jsonb))
+          IN ('object', 'null')
+      AND (
+          u.address::jsonb -> 'geolocation' ->> 'lat' IS NULL
+          OR (u.address::jsonb -> 'geolocation' ->> 'lat') ~ '{_JSON_NUMBER_PATTERN}'
+      )
+      AND (
+          u.address::jsonb -> 'geolocation' ->> 'long' IS NULL
+          OR (u.address::jsonb -> 'geolocation' ->> 'long') ~ '{_JSON_NUMBER_PATTERN}'
+      )
+"""
+
+
+def _json_text(value: Any) -> str:
+    """A JSON scalar as PostgreSQL's ->> renders it, '' for null"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _json_float(value: Any) -> float:
+    """
+    A JSON coordinate as the pushdown casts it, 0.0 for null
+
+    Raises:
+        ValueError: If the value is not a number or a numeric string
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, bool) or not _JSON_NUMBER.match(_json_text(value)):
+        raise ValueError(f"{value!r} is not a number")
+    return float(value)
+
+
+def ods_users_pushdown_sql(target: str = "ods_users") -> TextClause:
+    """Set-based load of well-formed users into ods_users or its shadow table"""
+    return text(f"INSERT INTO {target} ({', '.join(ODS_USERS_COLUMNS)})" + _ODS_USERS_SELECT)
+
+
+ODS_USERS_PUSHDOWN_SQL = ods_users_pushdown_sql()
+
+ODS_USERS_INCREMENTAL_SQL = text(
+    f"INSERT INTO ods_users ({', '.join(ODS_USERS_COLUMNS)})"
+    + _ODS_USERS_SELECT
+    + """
+      AND (
+          u.id = ANY(:user_ids)
+          OR NOT EXISTS (SELECT 1 FROM ods_users o WHERE o.user_id = u.id)
+      )
+    ON CONFLICT (user_id) DO UPDATE SET
+    """
+    + ", ".join(f"{name} = EXCLUDED.{name}" for name in ODS_USERS_COLUMNS[1:])
+    + " RETURNING user_id"
+)
+
+
 class OdsUsersTransformer:
     """
     Transforms user data for storage in the Operational Data Store (ODS).
 
+    Users the per-row path cannot process are quarantined in etl_rejects
+    under the "ods_users" source.
+
     Methods:
         transform: Performs the complete ETL process for user data
     """
 
+    source = "ods_users"
+    inputs = ("users",)
+    outputs = ("ods_users",)
+
     @staticmethod
-    async def transform(db_session: AsyncSession) -> int:
+    def reject_user(
+        user: UserDB, error: UserProcessingError, run_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the etl_rejects row for a user build_ods_user failed on"""
+        payload = {column.name: getattr(user, column.name) for column in UserDB.__table__.columns}
+        return reject_row(
+            OdsUsersTransformer.source,
+            STAGE_TRANSFORM,
+            Reject(0, payload, error_details(error)),
+            run_id,
+        )
+
+    @staticmethod
+    def build_ods_user(user: UserDB) -> OdsUser:
+        """
+        Builds an ODS row from a single user.
+
+        Raises:
+            UserProcessingError: If the user's name/address data is malformed
+        """
+        try:
+            name_data = user.name
+            address_data = user.address
+            geolocation = address_data.get("geolocation")
+            if geolocation is None:
+                geolocation = {}
+
+            # Same values as the pushdown select for every user both paths accept
+            return OdsUser(
+                user_id=user.id,
+                firstname=_json_text(name_data.get("firstname")),
+                lastname=_json_text(name_data.get("lastname")),
+                lat=_json_float(geolocation.get("lat")),
+                long=_json_float(geolocation.get("long")),
+                street_number=_json_text(address_data.get("number")),
+                street=_json_text(address_data.get("street")),
+                zipcode=_json_text(address_data.get("zipcode")),
+                city=_json_text(address_data.get("city")),
+            )
+        except (ValueError, AttributeError, KeyError) as e:
+            raise UserProcessingError(
+                f"Invalid data structure for user {user.id}: {str(e)}"
+            ) from e
+        except Exception as e:
+            raise UserProcessingError(
+                f"Unexpected error processing user {user.id}: {str(e)}"
+            ) from e
+
+    @staticmethod
+    async def transform(
+        db_session: AsyncSession,
+        pushdown: Optional[bool] = None,
+        user_ids: Optional[Set[int]] = None,
+        run_id: Optional[str] = None,
+        shadow: Optional[bool] = None,
+    ) -> int:
         """
         Extracts, transforms and loads user data into the ODS table.
 
+        In pushdown mode well-formed users are copied with a single
+        INSERT ... SELECT using PostgreSQL JSON operators; only the rows it
+        rejects go through the per-row Python path. A full rebuild in shadow
+        mode fills ods_users_next and renames it over ods_users on commit,
+        instead of deleting and refilling the live table.
+
+        Args:
+            db_session: Database session
+            pushdown: Use the set-based SQL path (defaults to ODS_USERS_PUSHDOWN)
+            user_ids: Ids of users inserted or updated by the current load; when
+                given, only those rows are refreshed instead of rebuilding the table
+            run_id: Run recorded with quarantined users
+            shadow: Rebuild into a shadow table and swap it in
+                (defaults to MART_SHADOW_BUILD, ignored for incremental refreshes)
+
         Returns:
             int: Number of successfully processed users
 
         Raises:
             OdsUsersTransformationError: If any step of the transformation fails
-            UserProcessingError: If processing of an individual user fails (logged but doesn't stop processing)
+            UserProcessingError: If processing of an individual user fails (quarantined, doesn't stop processing)
         """
+        if pushdown is None:
+            pushdown = settings.ODS_USERS_PUSHDOWN
+        if shadow is None:
+            shadow = settings.MART_SHADOW_BUILD
+
+        if user_ids is not None:
+            return await OdsUsersTransformer.transform_incremental(
+                db_session, user_ids, pushdown, run_id
+            )
+
         try:
             try:
-                await db_session.execute(OdsUser.__table__.delete())
+                if shadow:
+                    target = await prepare_shadow(db_session, OdsUser.__table__)
+                else:
+                    target = OdsUser.__table__
+                    await db_session.execute(target.delete())
             except Exception as e:
                 raise OdsUsersTransformationError(
                     f"Failed to clear OdsUser table: {str(e)}"
                 ) from e
 
+            count = 0
+            stmt = select(UserDB)
+
+            if pushdown:
+                try:
+                    result = await db_session.execute(ods_users_pushdown_sql(target.name))
+                    count = result.rowcount
+                except Exception as e:
+                    raise OdsUsersTransformationError(
+                        f"Failed to load users with SQL pushdown: {str(e)}"
+                    ) from e
+
+                stmt = stmt.where(~exists().where(target.c.user_id == UserDB.id))
+
             try:
-                stmt = select(UserDB)
                 result = await db_session.execute(stmt)
                 users = result.scalars().all()
             except Exception as e:
@@ -119,45 +453,23 @@ class OdsUsersTransformer:
                     f"Failed to fetch users: {str(e)}"
                 ) from e
 
-            count = 0
+            rows = []
+            rejects: List[Dict[str, Any]] = []
             for user in users:
                 try:
-                    try:
-                        name_data = user.name
-                        firstname = name_data.get("firstname", "")
-                        lastname = name_data.get("lastname", "")
-
-                        address_data = user.address
-                        geolocation = address_data.get("geolocation", {})
-
-                        db_session.add(
-                            OdsUser(
-                                user_id=user.id,
-                                firstname=firstname,
-                                lastname=lastname,
-                                lat=float(geolocation.get("lat", 0.0)),
-                                long=float(geolocation.get("long", 0.0)),
-                                street_number=str(address_data.get("number", "")),
-                                street=str(address_data.get("street", "")),
-                                zipcode=str(address_data.get("zipcode", "")),
-                                city=str(address_data.get("city", "")),
-                            )
-                        )
-                        count += 1
-                    except (ValueError, AttributeError, KeyError) as e:
-                        raise UserProcessingError(
-                            f"Invalid data structure for user {user.id}: {str(e)}"
-                        ) from e
-                    except Exception as e:
-                        raise UserProcessingError(
-                            f"Unexpected error processing user {user.id}: {str(e)}"
-                        ) from e
-
+                    ods_user = OdsUsersTransformer.build_ods_user(user)
+                    rows.append({name: getattr(ods_user, name) for name in ODS_USERS_COLUMNS})
                 except UserProcessingError as e:
                     logger.warning(str(e))
-                    continue
+                    rejects.append(OdsUsersTransformer.reject_user(user, e, run_id))
+            count += len(rows)
 
             try:
+                if rows:
+                    await db_session.execute(insert(target), rows)
+                await write_rejects(db_session, rejects)
+                if shadow:
+                    await swap_shadow(db_session, OdsUser.__table__)
                 await db_session.commit()
                 return count
             except Exception as e:
@@ -174,29 +486,191 @@ class OdsUsersTransformer:
                 f"Unexpected error in OdsUsers transform: {str(e)}"
             ) from e
 
+    @staticmethod
+    async def transform_incremental(
+        db_session: AsyncSession,
+        user_ids: Set[int],
+        pushdown: bool = True,
+        run_id: Optional[str] = None,
+    ) -> int:
+        """
+        Refreshes ods_users only for the given users.
+
+        Rows of changed users (and of users that have no ODS row yet) are
+        upserted on user_id, ODS rows of users that no longer exist are deleted.
+
+        Returns:
+            int: Number of upserted users
 
-async def run_transformations(db_session: AsyncSession) -> Dict[str, int]:
+        Raises:
+            OdsUsersTransformationError: If any step of the transformation fails
+        """
+        ids = sorted(user_ids)
+
+        try:
+            try:
+                removed = await db_session.execute(
+                    delete(OdsUser).where(~exists().where(UserDB.id == OdsUser.user_id))
+                )
+            except Exception as e:
+                raise OdsUsersTransformationError(
+                    f"Failed to delete removed users from OdsUser table: {str(e)}"
+                ) from e
+
+            handled: Set[int] = set()
+            if pushdown:
+                try:
+                    result = await db_session.execute(
+                        ODS_USERS_INCREMENTAL_SQL, {"user_ids": ids}
+                    )
+                    handled = set(result.scalars().all())
+                except Exception as e:
+                    raise OdsUsersTransformationError(
+                        f"Failed to upsert users with SQL pushdown: {str(e)}"
+                    ) from e
+
+            try:
+                result = await db_session.execute(
+                    select(UserDB).where(
+                        or_(
+                            UserDB.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))),
+                            ~exists().where(OdsUser.user_id == UserDB.id),
+                        )
+                    )
+                )
+                users = [user for user in result.scalars().all() if user.id not in handled]
+            except Exception as e:
+                raise OdsUsersTransformationError(
+                    f"Failed to fetch users: {str(e)}"
+                ) from e
+
+            rows = []
+            rejected = []
+            rejects: List[Dict[str, Any]] = []
+            for user in users:
+                try:
+                    ods_user = OdsUsersTransformer.build_ods_user(user)
+                    rows.append({name: getattr(ods_user, name) for name in ODS_USERS_COLUMNS})
+                except UserProcessingError as e:
+                    logger.warning(str(e))
+                    rejected.append(user.id)
+                    rejects.append(OdsUsersTransformer.reject_user(user, e, run_id))
+
+            try:
+                if rows:
+                    stmt = insert(OdsUser)
+                    await db_session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=["user_id"],
+                            set_={name: stmt.excluded[name] for name in ODS_USERS_COLUMNS[1:]},
+                        ),
+                        rows,
+                    )
+                if rejected:
+                    # Drop stale rows of users whose new data can no longer be processed
+                    await db_session.execute(
+                        delete(OdsUser).where(OdsUser.user_id.in_(rejected))
+                    )
+                await write_rejects(db_session, rejects)
+                await db_session.commit()
+            except Exception as e:
+                await db_session.rollback()
+                raise OdsUsersTransformationError(
+                    f"Failed to commit OdsUser changes: {str(e)}"
+                ) from e
+
+            count = len(handled) + len(rows)
+            logger.info(
+                f"Incrementally refreshed {count} ods_users, "
+                f"removed {removed.rowcount} deleted users"
+            )
+            return count
+
+        except OdsUsersTransformationError:
+            raise
+        except Exception as e:
+            await db_session.rollback()
+            raise OdsUsersTransformationError(
+                f"Unexpected error in incremental OdsUsers transform: {str(e)}"
+            ) from e
+
+
+TRANSFORM_PREFIX = "transform."
+
+
+def transform_nodes(run: Optional[EtlRun] = None) -> List[Node]:
     """
-    Executes all data transformations and returns processing statistics.
+    DAG nodes of every transformation, wired to the tables they read and write
 
-    Returns:
-        Dict[str, int]: Dictionary with transformation results:
-           - "most_expensive": count of processed products
-           - "ods_users": count of processed users
-           (values will be 0 if transformation failed)
+    When ODS_USERS_INCREMENTAL is enabled and a run is given, ods_users is only
+    refreshed for the users the run's loaders inserted or updated; the ids are
+    read when the node starts, after the users load has finished.
+
+    With MART_BACKEND set to "matview" the product marts are PostgreSQL
+    materialized views refreshed concurrently instead of tables rebuilt by
+    MostExpensiveTransformer.
+
+    Raises:
+        ValueError: If MART_BACKEND is not a known backend
     """
-    results: dict[str, int] = {}
+    if settings.MART_BACKEND not in MART_BACKENDS:
+        raise ValueError(
+            f"Unknown mart backend '{settings.MART_BACKEND}', expected one of {MART_BACKENDS}"
+        )
+
+    async def ods_users(db_session: AsyncSession) -> int:
+        user_ids = None
+        if run is not None and settings.ODS_USERS_INCREMENTAL:
+            user_ids = run.changed_ids.get("users", set())
+        return await OdsUsersTransformer.transform(
+            db_session, user_ids=user_ids, run_id=run.run_id if run is not None else None
+        )
+
+    if settings.MART_BACKEND == MART_BACKEND_MATVIEW:
+        product_marts = materialized_view_nodes(TRANSFORM_PREFIX)
+    else:
+        product_marts = [
+            Node(
+                f"{TRANSFORM_PREFIX}most_expensive",
+                MostExpensiveTransformer.transform,
+                MostExpensiveTransformer.inputs,
+                MostExpensiveTransformer.outputs,
+            ),
+        ]
 
-    try:
-        results["most_expensive"] = await MostExpensiveTransformer.transform(db_session)
-    except MostExpensiveTransformationError as e:
-        logger.error(str(e))
-        results["most_expensive"] = 0
+    return product_marts + [
+        Node(
+            f"{TRANSFORM_PREFIX}sales_aggregates",
+            SalesAggregatesTransformer.transform,
+            SalesAggregatesTransformer.inputs,
+            SalesAggregatesTransformer.outputs,
+        ),
+        Node(
+            f"{TRANSFORM_PREFIX}ods_users",
+            ods_users,
+            OdsUsersTransformer.inputs,
+            OdsUsersTransformer.outputs,
+        ),
+    ]
 
-    try:
-        results["ods_users"] = await OdsUsersTransformer.transform(db_session)
-    except OdsUsersTransformationError as e:
-        logger.error(str(e))
-        results["ods_users"] = 0
 
-    return results
+def collect_transformations(
+    results: Dict[str, NodeResult], run: Optional[EtlRun] = None
+) -> Dict[str, int]:
+    """
+    Record the timing of every finished node and extract transformation counts
+
+    Returns:
+        Processed row count per transformation, 0 if it failed or was skipped
+    """
+    transformations: Dict[str, int] = {}
+    for name, result in results.items():
+        if result.status != STATUS_SKIPPED:
+            if run is not None:
+                run.record_stage(name, result.seconds)
+            else:
+                ETL_STAGE_DURATION.observe(result.seconds, stage=name)
+        if name.startswith(TRANSFORM_PREFIX):
+            transformations[name[len(TRANSFORM_PREFIX):]] = result.value or 0
+    return transformations
+
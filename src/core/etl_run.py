@@ -0,0 +1,97 @@
+import time
+import uuid
+import logging
+import typing as t
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config.database import AsyncSessionLocal
+from src.config.settings import settings
+from src.core.metrics import ETL_STAGE_DURATION
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+# Distinguishes versions of this process from those of earlier processes and
+# other workers, whose local counters also start at 0
+_process_nonce = uuid.uuid4().hex[:8]
+_data_version = 0
+_database_marker = ""
+_database_marker_checked = 0.0
+
+_DATABASE_MARKER_SQL = text("""
+    SELECT
+        (SELECT run_id FROM etl_runs ORDER BY started_at DESC LIMIT 1),
+        (SELECT max(resolved_at) FROM etl_rejects)
+""")
+
+
+def data_version() -> str:
+    """
+    Version of the loaded data
+
+    Combines a per-process nonce, the local counter bumped every time the ETL
+    of this process writes to the database, and the database marker fetched
+    by sync_data_version, which catches writes made by other processes.
+    """
+    return f"{_process_nonce}.{_data_version}.{_database_marker}"
+
+
+def bump_data_version() -> str:
+    """Mark the data as changed so caches keyed on data_version() are invalidated"""
+    global _data_version
+    _data_version += 1
+    return data_version()
+
+
+async def sync_data_version() -> str:
+    """
+    Refresh the database part of data_version(), at most every DATA_VERSION_TTL seconds
+
+    The marker is the latest persisted ETL run and the latest replayed reject,
+    so runs from cron, `--once` or another worker invalidate this process's caches.
+    """
+    global _database_marker, _database_marker_checked
+
+    now = time.monotonic()
+    if now - _database_marker_checked < settings.DATA_VERSION_TTL:
+        return data_version()
+    _database_marker_checked = now
+
+    try:
+        async with AsyncSessionLocal() as session:
+            run_id, resolved_at = (await session.execute(_DATABASE_MARKER_SQL)).one()
+        _database_marker = f"{run_id or ''}.{resolved_at.timestamp() if resolved_at else ''}"
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to read the data version from the database: {str(e)}")
+    return data_version()
+
+
+class EtlRun:
+    """
+    State collected over a single ETL run.
+
+    Attributes:
+        run_id: Unique identifier of the run
+        started_at: UTC time the run was created
+        stats: Per-source row counts ("inserted", "updated", "unchanged")
+        changed_ids: Per-source ids of rows inserted or updated during the run
+        stage_seconds: Time spent per stage, e.g. "products.extract" or
+            "transform.ods_users"
+        bytes_fetched: Per-source size of the API responses
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex
+        self.started_at = datetime.now(timezone.utc)
+        self.stats: t.Dict[str, t.Dict[str, int]] = {}
+        self.changed_ids: t.Dict[str, t.Set[t.Any]] = {}
+        self.stage_seconds: t.Dict[str, float] = {}
+        self.bytes_fetched: t.Dict[str, int] = {}
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Add the duration of a stage to the run and to the stage histogram"""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        ETL_STAGE_DURATION.observe(seconds, stage=stage)
@@ -16,7 +16,19 @@ class OdsUsersTransformationError(TransformationError):
     pass
 
 
+class SalesAggregatesTransformationError(TransformationError):
+    """Error during SalesAggregates transformation"""
+
+    pass
+
+
 class UserProcessingError(TransformationError):
     """Error when processing individual user"""
 
     pass
+
+
+class ExtractionError(Exception):
+    """Error when fetching data from a source API"""
+
+    pass
@@ -0,0 +1,143 @@
+import time
+import random
+import asyncio
+import logging
+import importlib.util
+
+import httpx
+import typing as t
+
+from src.config.settings import settings
+from src.core.exception import ExtractionError
+from src.core.metrics import HTTP_REQUEST_DURATION, HTTP_RESPONSE_BYTES
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostRateLimiter:
+    """Spaces out requests so that each host receives at most ``rate`` requests per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: t.Dict[str, float] = {}
+        self._locks: t.Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = asyncio.get_running_loop().time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by all data loaders.
+
+    Keeps one keep-alive connection pool (optionally HTTP/2) for the lifetime of
+    the process and retries transient failures with exponential backoff and jitter.
+    """
+
+    def __init__(self):
+        self._client: t.Optional[httpx.AsyncClient] = None
+        self.rate_limiter = HostRateLimiter(settings.HTTP_RATE_LIMIT_PER_HOST)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = settings.HTTP2
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+
+            self._client = httpx.AsyncClient(
+                timeout=settings.HTTP_TIMEOUT,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    @staticmethod
+    def backoff(attempt: int, response: t.Optional[httpx.Response] = None) -> float:
+        """Delay before the next attempt: Retry-After if given, otherwise full-jitter exponential"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), settings.HTTP_BACKOFF_MAX)
+
+        cap = min(settings.HTTP_BACKOFF_MAX, settings.HTTP_BACKOFF_BASE * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    async def get(self, url: str, params: t.Optional[t.Dict[str, t.Any]] = None) -> httpx.Response:
+        """
+        Perform a GET request with retries on connection errors and retryable statuses
+
+        Raises:
+            ExtractionError: If the request still fails after all retries
+        """
+        host = httpx.URL(url).host
+        retries = settings.HTTP_RETRIES
+
+        for attempt in range(retries + 1):
+            await self.rate_limiter.wait(host)
+            response = None
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(url, params=params)
+                HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, host=host)
+                HTTP_RESPONSE_BYTES.inc(len(response.content), host=host)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    raise ExtractionError(f"Request to {url} failed: {str(e)}") from e
+                error = e
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise ExtractionError(f"Request to {url} failed: {str(e)}") from e
+                error = e
+
+            delay = self.backoff(attempt, response)
+            logger.warning(
+                f"Request to {url} failed ({str(error)}), "
+                f"retry {attempt + 1}/{retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+        raise ExtractionError(f"Request to {url} failed")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_http_client: t.Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its connection pool"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,57 @@
+import time
+import logging
+import typing as t
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dag import Node
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+MART_BACKEND_TABLE = "table"
+MART_BACKEND_MATVIEW = "matview"
+MART_BACKENDS = (MART_BACKEND_TABLE, MART_BACKEND_MATVIEW)
+
+# Materialized views created by migrations, with the tables they are built from
+MATERIALIZED_VIEWS: t.Dict[str, t.Tuple[str, ...]] = {
+    "mv_most_expensive": ("products",),
+    "mv_category_summary": ("products",),
+}
+
+_IS_POPULATED_SQL = text("SELECT relispopulated FROM pg_class WHERE oid = CAST(:name AS regclass)")
+
+
+async def refresh_materialized_view(db_session: AsyncSession, name: str) -> int:
+    """
+    Refresh a materialized view and return its row count
+
+    CONCURRENTLY keeps the view readable during the refresh; it needs the
+    view's unique index and a populated view, so the very first refresh of
+    a view created WITH NO DATA is a plain one.
+    """
+    if name not in MATERIALIZED_VIEWS:
+        raise ValueError(f"Unknown materialized view '{name}'")
+
+    started = time.perf_counter()
+    populated = (await db_session.execute(_IS_POPULATED_SQL, {"name": name})).scalar()
+    concurrently = " CONCURRENTLY" if populated else ""
+    await db_session.execute(text(f'REFRESH MATERIALIZED VIEW{concurrently} "{name}"'))
+    count = (await db_session.execute(text(f'SELECT count(*) FROM "{name}"'))).scalar()
+    await db_session.commit()
+
+    logger.info(f"Refreshed {name} with {count} rows in {time.perf_counter() - started:.3f}s")
+    return count
+
+
+def materialized_view_nodes(prefix: str) -> t.List[Node]:
+    """DAG nodes refreshing every materialized view once its source tables are loaded"""
+
+    def node(name: str, inputs: t.Tuple[str, ...]) -> Node:
+        async def refresh(db_session: AsyncSession) -> int:
+            return await refresh_materialized_view(db_session, name)
+
+        return Node(f"{prefix}{name}", refresh, inputs, (name,))
+
+    return [node(name, inputs) for name, inputs in MATERIALIZED_VIEWS.items()]
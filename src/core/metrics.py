@@ -0,0 +1,143 @@
+import math
+import typing as t
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: t.Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class of in-process metrics rendered in the Prometheus text format"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: t.Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        REGISTRY.append(self)
+
+    def _key(self, labels: t.Dict[str, t.Any]) -> t.Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: t.Tuple[str, ...]) -> t.Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def samples(self) -> t.Iterator[str]:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: t.Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: t.Dict[t.Tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: t.Any) -> None:
+        self._values[self._key(labels)] += amount
+
+    def value(self, **labels: t.Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> t.Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: t.Any) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: t.Sequence[str] = (),
+            buckets: t.Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+        self._counts: t.Dict[t.Tuple[str, ...], t.List[int]] = {}
+        self._sums: t.Dict[t.Tuple[str, ...], float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: t.Any) -> None:
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self._sums[key] += value
+
+    def total(self, **labels: t.Any) -> float:
+        """Sum of all observed values for the given labels"""
+        return self._sums.get(self._key(labels), 0.0)
+
+    def samples(self) -> t.Iterator[str]:
+        for key, counts in self._counts.items():
+            labels = self._labels(key)
+            for bound, count in zip(self.buckets, counts):
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                yield f"{self.name}_bucket{bucket_labels} {count}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{_format_labels(labels)} {counts[-1]}"
+
+
+REGISTRY: t.List[Metric] = []
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format"""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+ETL_RUNS = Counter("etl_runs_total", "Finished ETL runs", ("status",))
+ETL_RUN_DURATION = Histogram("etl_run_duration_seconds", "Wall-clock duration of ETL runs")
+ETL_STAGE_DURATION = Histogram(
+    "etl_stage_duration_seconds", "Duration of individual ETL stages", ("stage",)
+)
+ETL_ROWS = Counter("etl_rows_total", "Rows seen by the loaders", ("source", "status"))
+ETL_ROWS_PER_SECOND = Gauge(
+    "etl_rows_per_second", "Throughput of the last load per source", ("source",)
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "etl_http_request_duration_seconds", "Latency of source API requests", ("host",)
+)
+HTTP_RESPONSE_BYTES = Counter(
+    "etl_http_response_bytes_total", "Bytes fetched from source APIs", ("host",)
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds", "Execution time of SQL statements", ("engine",)
+)
+DB_POOL = Gauge("db_pool", "Connection pool statistics per engine", ("engine", "stat"))
@@ -1,8 +1,10 @@
 import typing as t
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Any, Optional
 from fastapi import Request
 
+from src.core.utils import json_codec
+
 
 class TableTemplateContext(BaseModel):
     request: Request
@@ -13,8 +15,11 @@ class TableTemplateContext(BaseModel):
     per_page: int = Field(ge=1, le=100)
     total_pages: int = Field(ge=1)
     total_items: int = Field(ge=0)
+    total_estimated: bool = False
     sort_by: Optional[str] = None
     sort_order: str = Field(pattern="^(asc|desc)$")
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -31,6 +36,8 @@ class Geolocation(BaseModel):
 
 
 class Address(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
     city: str
     street: str
     number: str
@@ -47,6 +54,17 @@ class User(BaseModel):
     address: Address
     phone: str
 
+    @field_validator("address", mode="before")
+    @classmethod
+    def parse_address(cls, value: t.Any) -> t.Any:
+        """The users API may send the address as a JSON-encoded string"""
+        if not isinstance(value, str):
+            return value
+        try:
+            return json_codec.loads(value)
+        except json_codec.DecodeError as e:
+            raise ValueError(f"address is not valid JSON: {e}") from e
+
 
 class UsersResponse(BaseModel):
     status: str
@@ -0,0 +1,91 @@
+import time
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config.database import EtlSessionLocal
+from src.config.settings import settings
+from src.core.dag import STATUS_SUCCESS, Dag
+from src.core.data_loader import LOAD_POOL, LOAD_PREFIX, load_nodes
+from src.core.data_transform import collect_transformations, transform_nodes
+from src.core.etl_run import EtlRun, bump_data_version
+from src.core.metrics import DB_STATEMENT_DURATION, ETL_RUN_DURATION, ETL_RUNS
+from src.db.table import EtlRunDB
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+
+async def save_run(
+        run: EtlRun,
+        success: bool,
+        duration: float,
+        db_seconds: float,
+        transformations: dict
+) -> None:
+    """Persist the run summary into etl_runs for trend analysis"""
+    try:
+        async with EtlSessionLocal() as session:
+            await session.execute(
+                insert(EtlRunDB).values(
+                    run_id=run.run_id,
+                    started_at=run.started_at,
+                    finished_at=datetime.now(timezone.utc),
+                    success=success,
+                    duration_seconds=duration,
+                    db_seconds=db_seconds,
+                    stages=run.stage_seconds,
+                    stats=run.stats,
+                    bytes_fetched=run.bytes_fetched,
+                    transformations=transformations,
+                )
+            )
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Failed to save ETL run {run.run_id}: {str(e)}")
+
+
+async def run_etl() -> bool:
+    """
+    Runs one full ETL cycle: load all sources and rebuild the marts.
+
+    Loads and transformations form one DAG, so every mart starts as soon as
+    the loads of the tables it reads have finished. Independent nodes run
+    concurrently on their own sessions, up to ETL_MAX_CONCURRENCY at once;
+    unless ETL_CONCURRENT_LOAD is set the source loads run one at a time.
+
+    Stage timings and row counts are published to the metrics registry and the
+    run summary is stored in etl_runs.
+
+    Returns:
+        True if data loading succeeded
+    """
+    run = EtlRun()
+    started = time.perf_counter()
+    db_started = DB_STATEMENT_DURATION.total(engine="etl")
+
+    pool_limits = {} if settings.ETL_CONCURRENT_LOAD else {LOAD_POOL: 1}
+    results = await Dag(load_nodes(run) + transform_nodes(run)).run(pool_limits=pool_limits)
+    bump_data_version()
+    success = all(
+        result.status == STATUS_SUCCESS
+        for name, result in results.items()
+        if name.startswith(LOAD_PREFIX)
+    )
+    transformations = collect_transformations(results, run)
+
+    duration = time.perf_counter() - started
+    db_seconds = DB_STATEMENT_DURATION.total(engine="etl") - db_started
+    ETL_RUNS.inc(status="success" if success else "failure")
+    ETL_RUN_DURATION.observe(duration)
+    await save_run(run, success, duration, db_seconds, transformations)
+
+    if success:
+        logger.info(
+            f"Data loading completed successfully in {duration:.2f}s: {run.stats}, "
+            f"stages: {run.stage_seconds}"
+        )
+    else:
+        logger.error("Data loading encountered errors")
+    return success
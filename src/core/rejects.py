@@ -0,0 +1,133 @@
+import json
+import hashlib
+import logging
+import typing as t
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.validation import Reject
+from src.db.table import EtlRejectDB
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+STAGE_VALIDATE = "validate"
+STAGE_TRANSFORM = "transform"
+
+RejectRow = t.Dict[str, t.Any]
+
+
+def error_details(error: BaseException) -> t.List[t.Dict[str, t.Any]]:
+    """Describe an exception in the same shape as validation errors"""
+    return [{"loc": [], "type": type(error).__name__, "msg": str(error)}]
+
+
+def reject_row(
+        source: str,
+        stage: str,
+        reject: Reject,
+        run_id: t.Optional[str] = None
+) -> RejectRow:
+    """
+    Build an etl_rejects row for a rejected record
+
+    Records without an id are identified by a digest of their payload, so the
+    same bad record is recognised again on the next run.
+    """
+    record_id = reject.record_id
+    if record_id is None:
+        payload = json.dumps(reject.record, sort_keys=True, separators=(",", ":"), default=str)
+        record_id = "sha:" + hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    return {
+        "source": source,
+        "stage": stage,
+        "record_id": record_id,
+        "run_id": run_id,
+        "payload": reject.record,
+        "errors": reject.errors,
+    }
+
+
+async def write_rejects(db_session: AsyncSession, rows: t.List[RejectRow]) -> None:
+    """
+    Upsert rejected records into etl_rejects with a single statement
+
+    A record that already has an unresolved reject for the same source and
+    stage updates that row (latest payload, errors and run, one more attempt)
+    instead of adding a new one, so runs hitting the same bad data do not
+    grow the table.
+
+    The caller owns the transaction and commits it together with its own work.
+    """
+    if not rows:
+        return
+    # ON CONFLICT cannot update the same row twice in one statement
+    rows = list({(row["source"], row["stage"], row["record_id"]): row for row in rows}.values())
+
+    stmt = insert(EtlRejectDB)
+    await db_session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["source", "stage", "record_id"],
+            index_where=EtlRejectDB.resolved_at.is_(None),
+            set_={
+                "payload": stmt.excluded.payload,
+                "errors": stmt.excluded.errors,
+                "run_id": stmt.excluded.run_id,
+                "attempts": EtlRejectDB.attempts + 1,
+            },
+        ),
+        rows,
+    )
+    logger.warning(
+        f"Quarantined {len(rows)} records in etl_rejects "
+        f"({', '.join(sorted({row['source'] for row in rows}))})"
+    )
+
+
+async def pending_rejects(
+        db_session: AsyncSession,
+        source: str,
+        run_id: t.Optional[str] = None,
+        limit: t.Optional[int] = None
+) -> t.List[EtlRejectDB]:
+    """Unresolved rejects of a source, oldest first"""
+    stmt = (
+        select(EtlRejectDB)
+        .where(EtlRejectDB.source == source, EtlRejectDB.resolved_at.is_(None))
+        .order_by(EtlRejectDB.id)
+        .limit(limit)
+    )
+    if run_id is not None:
+        stmt = stmt.where(EtlRejectDB.run_id == run_id)
+    result = await db_session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def mark_resolved(db_session: AsyncSession, reject_ids: t.List[int]) -> None:
+    """Flag replayed rejects as resolved"""
+    if reject_ids:
+        await db_session.execute(
+            update(EtlRejectDB.__table__)
+            .where(EtlRejectDB.id.in_(reject_ids))
+            .values(resolved_at=func.now(), attempts=EtlRejectDB.attempts + 1)
+        )
+
+
+async def mark_failed(
+        db_session: AsyncSession,
+        failures: t.Dict[int, t.List[t.Dict[str, t.Any]]]
+) -> None:
+    """Store the latest errors of rejects that failed to replay again"""
+    if failures:
+        table = EtlRejectDB.__table__
+        await db_session.execute(
+            update(table)
+            .where(table.c.id == bindparam("reject_id"))
+            .values(errors=bindparam("new_errors"), attempts=table.c.attempts + 1),
+            [
+                {"reject_id": reject_id, "new_errors": errors}
+                for reject_id, errors in failures.items()
+            ],
+        )
@@ -0,0 +1,163 @@
+"""
+Reprocess records quarantined in etl_rejects once the cause has been fixed.
+
+    python -m src.core.replay                      # every source
+    python -m src.core.replay --source products
+    python -m src.core.replay --source ods_users --run-id <run id>
+
+Replayed records that now succeed are marked resolved; the others keep their
+row with the latest errors and an incremented attempt counter.
+"""
+import asyncio
+import logging
+import typing as t
+
+import typer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import EtlSessionLocal
+from src.config.settings import settings
+from src.core.data_loader import SourceDataLoader
+from src.core.data_transform import OdsUsersTransformer
+from src.core.etl_run import bump_data_version
+from src.core.rejects import mark_failed, mark_resolved, pending_rejects
+from src.core.sources import SOURCES
+from src.db.table import EtlRejectDB, OdsUser
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+cli = typer.Typer(add_completion=False)
+
+
+async def replay_source_rejects(
+        db_session: AsyncSession,
+        rejects: t.List[EtlRejectDB],
+        source: str
+) -> t.Dict[int, t.List[t.Dict[str, t.Any]]]:
+    """
+    Validate, transform and upsert quarantined records of a registered source
+
+    Returns:
+        Errors of the rejects that still fail, keyed by reject id
+    """
+    loader = SourceDataLoader(SOURCES[source], columnar=False)
+    records = [reject.payload for reject in rejects]
+    failed: t.Dict[int, t.List[t.Dict[str, t.Any]]] = {}
+
+    valid, invalid = loader.validate_records(records)
+    for reject in invalid:
+        failed[reject.index] = reject.errors
+
+    positions = [index for index in range(len(records)) if index not in failed]
+    rows, transform_rejects = loader.transform_records(valid)
+    for reject in transform_rejects:
+        failed[positions[reject.index]] = reject.errors
+
+    if len(rows):
+        await loader.upsert_data(
+            db_session,
+            loader.table,
+            loader.add_content_hashes(rows),
+            loader.conflict_index,
+            loader.exclude_fields,
+        )
+    return {rejects[index].id: errors for index, errors in failed.items()}
+
+
+async def replay_ods_users_rejects(
+        db_session: AsyncSession,
+        rejects: t.List[EtlRejectDB]
+) -> t.Set[int]:
+    """
+    Rebuild the ODS rows of quarantined users
+
+    Users that fail again are re-quarantined by transform_incremental, which
+    updates their open reject with the new errors.
+
+    Returns:
+        Ids of the rejects that still fail
+    """
+    user_ids = {reject.payload["id"] for reject in rejects}
+    await OdsUsersTransformer.transform_incremental(
+        db_session, user_ids, settings.ODS_USERS_PUSHDOWN
+    )
+    result = await db_session.execute(
+        select(OdsUser.user_id).where(OdsUser.user_id.in_(user_ids))
+    )
+    processed = set(result.scalars().all())
+    return {reject.id for reject in rejects if reject.payload["id"] not in processed}
+
+
+async def replay(
+        source: t.Optional[str] = None,
+        run_id: t.Optional[str] = None,
+        limit: t.Optional[int] = None
+) -> t.Dict[str, t.Dict[str, int]]:
+    """
+    Replay unresolved rejects of one or every source
+
+    Args:
+        source: Source to replay ("ods_users" or a registered source), all if None
+        run_id: Only replay rejects recorded by this run
+        limit: Maximum number of rejects replayed per source
+
+    Returns:
+        Per-source counts of "resolved" and "failed" rejects
+    """
+    sources = [source] if source else [*SOURCES, OdsUsersTransformer.source]
+    results: t.Dict[str, t.Dict[str, int]] = {}
+
+    for name in sources:
+        if name not in SOURCES and name != OdsUsersTransformer.source:
+            raise ValueError(f"Unknown source '{name}'")
+
+        async with EtlSessionLocal() as session:
+            rejects = await pending_rejects(session, name, run_id, limit)
+            if not rejects:
+                continue
+
+            try:
+                if name == OdsUsersTransformer.source:
+                    failures = await replay_ods_users_rejects(session, rejects)
+                else:
+                    errors = await replay_source_rejects(session, rejects, name)
+                    await mark_failed(session, errors)
+                    failures = set(errors)
+
+                await mark_resolved(
+                    session, [reject.id for reject in rejects if reject.id not in failures]
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+        results[name] = {"resolved": len(rejects) - len(failures), "failed": len(failures)}
+        logger.info(
+            f"Replayed {len(rejects)} {name} rejects: "
+            f"{results[name]['resolved']} resolved, {results[name]['failed']} still failing"
+        )
+
+    if results:
+        bump_data_version()
+    return results
+
+
+@cli.command()
+def main(
+        source: t.Optional[str] = typer.Option(None, help="Source to replay, all if omitted"),
+        run_id: t.Optional[str] = typer.Option(None, help="Only replay rejects of this run"),
+        limit: t.Optional[int] = typer.Option(None, help="Maximum rejects per source"),
+):
+    """Reprocess quarantined records from etl_rejects"""
+    results = asyncio.run(replay(source, run_id, limit))
+    if not results:
+        typer.echo("No unresolved rejects")
+    for name, counts in results.items():
+        typer.echo(f"{name}: {counts['resolved']} resolved, {counts['failed']} still failing")
+
+
+if __name__ == "__main__":
+    cli()
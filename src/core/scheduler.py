@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import typing as t
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+
+class CronExpression:
+    """
+    Minimal five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Each field accepts ``*``, single values, ranges ``a-b``, steps ``*/n``,
+    ``a-b/n`` or ``a/n`` (from ``a`` to the field maximum) and comma-separated
+    lists. Day-of-week 0 and 7 are Sunday.
+
+    Raises:
+        ValueError: If the expression is malformed or can never match
+    """
+
+    FIELDS = (
+        ("minute", 0, 59),
+        ("hour", 0, 23),
+        ("day", 1, 31),
+        ("month", 1, 12),
+        ("weekday", 0, 7),
+    )
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(self.FIELDS):
+            raise ValueError(f"Cron expression must have 5 fields, got '{expression}'")
+
+        values = [
+            self._parse_field(part, low, high)
+            for part, (_, low, high) in zip(parts, self.FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        self.weekdays = {day % 7 for day in weekdays}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+        # Fail now rather than on the first tick for dates such as 30 February
+        self.next_after(datetime.now())
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> t.Set[int]:
+        values: t.Set[int] = set()
+        for item in field.split(","):
+            base, _, step = item.partition("/")
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                start, end = (int(bound) for bound in base.split("-", 1))
+            else:
+                start = int(base)
+                end = high if step else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{field}' is out of range {low}-{high}")
+            increment = int(step) if step else 1
+            if increment < 1:
+                raise ValueError(f"Cron field '{field}' has a step below 1")
+            values.update(range(start, end + 1, increment))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # cron weekday: 0 = Sunday, Python weekday(): 0 = Monday
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment``"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = candidate.replace(
+                    year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError("Cron expression never matches")
+
+
+class EtlScheduler:
+    """
+    Runs a job periodically as a background task of the running event loop.
+
+    Ticks come either from a fixed interval or from a cron expression. A tick
+    that fires while the previous run is still in progress is skipped, so runs
+    never overlap.
+    """
+
+    def __init__(
+        self,
+        job: t.Callable[[], t.Awaitable[t.Any]],
+        interval_seconds: float,
+        cron: t.Optional[str] = None,
+        run_on_startup: bool = True,
+    ):
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.cron = CronExpression(cron) if cron else None
+        self.run_on_startup = run_on_startup
+        self._lock = asyncio.Lock()
+        self._loop_task: t.Optional[asyncio.Task] = None
+        self._run_task: t.Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _next_delay(self) -> float:
+        if self.cron is not None:
+            now = datetime.now()
+            return (self.cron.next_after(now) - now).total_seconds()
+        return self.interval_seconds
+
+    async def trigger(self) -> bool:
+        """
+        Run the job now unless a run is already in progress
+
+        Returns:
+            False if the run was skipped because of an overlap
+        """
+        if self._lock.locked():
+            logger.warning("Previous ETL run is still in progress, skipping this one")
+            return False
+
+        async with self._lock:
+            try:
+                await self.job()
+            except Exception as e:
+                logger.error(f"Scheduled ETL run failed: {str(e)}", exc_info=True)
+        return True
+
+    def _fire(self) -> None:
+        if not self.running:
+            self._run_task = asyncio.create_task(self.trigger())
+        else:
+            logger.warning("Previous ETL run is still in progress, skipping this one")
+
+    async def _loop(self) -> None:
+        if self.run_on_startup:
+            self._fire()
+        while True:
+            try:
+                delay = self._next_delay()
+            except Exception as e:
+                logger.error(
+                    f"Failed to schedule the next ETL run, retrying in "
+                    f"{self.interval_seconds}s: {str(e)}",
+                    exc_info=True,
+                )
+                await asyncio.sleep(self.interval_seconds)
+                continue
+            await asyncio.sleep(max(0.0, delay))
+            self._fire()
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        for task in (self._loop_task, self._run_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = self._run_task = None
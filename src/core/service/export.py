@@ -0,0 +1,80 @@
+import io
+import csv
+import logging
+import typing as t
+
+from sqlalchemy import select
+
+from src.config.database import AsyncSessionLocal
+from src.config.settings import settings
+from src.core.utils import json_codec
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+
+def _dumps(value: t.Any) -> str:
+    return json_codec.dumps(value, default=str)
+
+
+def _csv_value(value: t.Any) -> t.Any:
+    return _dumps(value) if isinstance(value, (dict, list)) else value
+
+
+async def _iter_partitions(model: t.Any) -> t.AsyncIterator[t.List[t.Mapping[str, t.Any]]]:
+    """Read the table through a server-side cursor, EXPORT_BATCH_SIZE rows at a time"""
+    table = model.__table__
+    stmt = (
+        select(*table.columns)
+        .order_by(*table.primary_key.columns)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+
+async def export_table(model: t.Any, fmt: str) -> t.AsyncIterator[str]:
+    """
+    Serialize a whole table as NDJSON, CSV or a JSON array, chunk by chunk
+
+    Memory use is bounded by EXPORT_BATCH_SIZE regardless of the table size.
+    """
+    columns = [column.key for column in model.__table__.columns]
+
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for partition in _iter_partitions(model):
+                writer.writerows([_csv_value(row[name]) for name in columns] for row in partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+
+        elif fmt == "json":
+            yield "["
+            first = True
+            async for partition in _iter_partitions(model):
+                chunk = ",".join(_dumps(dict(row)) for row in partition)
+                yield chunk if first else "," + chunk
+                first = False
+            yield "]"
+
+        else:
+            async for partition in _iter_partitions(model):
+                yield "".join(_dumps(dict(row)) + "\n" for row in partition)
+
+    except Exception as e:
+        # Headers are already sent, so the client only sees a truncated body
+        logger.error(f"Export of {model.__tablename__} failed: {str(e)}")
+        raise
@@ -0,0 +1,161 @@
+import json
+import base64
+import binascii
+import typing as t
+from datetime import date, datetime
+from functools import lru_cache
+
+from sqlalchemy import Column, Table, and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, visitors
+
+from src.config.settings import settings
+from src.core.etl_run import data_version
+from src.core.utils.cache import TTLCache
+
+count_cache = TTLCache(maxsize=64, ttl=settings.TABLE_COUNT_CACHE_TTL)
+
+
+def encode_cursor(payload: t.Dict[str, t.Any]) -> str:
+    """Pack the keyset position into an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> t.Dict[str, t.Any]:
+    """
+    Unpack a token produced by encode_cursor
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    if not isinstance(payload, dict) or not {"v", "k", "p", "d"} <= payload.keys():
+        raise ValueError("Malformed cursor")
+    page = payload["p"]
+    if not isinstance(page, int) or isinstance(page, bool) or page < 1:
+        raise ValueError("Malformed cursor")
+    if payload["d"] not in ("next", "prev"):
+        raise ValueError("Malformed cursor")
+    return payload
+
+
+def coerce_cursor_value(column: Column, value: t.Any) -> t.Any:
+    """
+    Convert a value decoded from a cursor to the Python type of ``column``
+
+    Raises:
+        ValueError: If the value cannot belong to the column
+    """
+    if value is None:
+        if column.nullable:
+            return None
+        raise ValueError(f"Cursor value for '{column.name}' cannot be null")
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError as e:
+        raise ValueError(f"Column '{column.name}' cannot be used in a cursor") from e
+
+    if isinstance(value, bool) != (python_type is bool):
+        raise ValueError(f"Invalid cursor value for '{column.name}'")
+    if isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime, date) and isinstance(value, str):
+            return python_type.fromisoformat(value)
+        if python_type is float and isinstance(value, int):
+            return float(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor value for '{column.name}'") from e
+    raise ValueError(f"Invalid cursor value for '{column.name}'")
+
+
+@lru_cache(maxsize=None)
+def sortable_columns(table: Table) -> t.Tuple[str, ...]:
+    """
+    Columns a table can be sorted by without a full scan and sort
+
+    These are the primary key, unique columns and the leading column of every
+    B-tree index; GIN and other non-ordered indexes are ignored.
+    """
+    names = [column.name for column in table.primary_key.columns]
+    names += [column.name for column in table.columns if column.unique]
+
+    for index in table.indexes:
+        using = index.dialect_options["postgresql"]["using"]
+        if using and using != "btree":
+            continue
+        leading = next(
+            (element for element in visitors.iterate(index.expressions[0])
+             if isinstance(element, Column)),
+            None,
+        )
+        if leading is not None:
+            names.append(leading.name)
+
+    return tuple(dict.fromkeys(names))
+
+
+def seek_condition(
+        column: Column,
+        pk: Column,
+        value: t.Any,
+        key: t.Any,
+        descending: bool
+) -> ColumnElement:
+    """
+    WHERE clause selecting the rows after (value, key) in ORDER BY column, pk
+
+    NULL placement follows PostgreSQL defaults: last for ASC, first for DESC.
+    """
+    if column is pk:
+        return pk < key if descending else pk > key
+
+    after = column.__lt__ if descending else column.__gt__
+    pk_after = pk < key if descending else pk > key
+
+    if not column.nullable:
+        return or_(after(value), and_(column == value, pk_after))
+
+    if value is None:
+        if descending:
+            return or_(and_(column.is_(None), pk_after), column.isnot(None))
+        return and_(column.is_(None), pk_after)
+
+    condition = or_(after(value), and_(column == value, pk_after))
+    return condition if descending else or_(condition, column.is_(None))
+
+
+async def count_rows(session: AsyncSession, table_name: str, model: t.Any) -> t.Tuple[int, bool]:
+    """
+    Row count of a table, served from a TTL cache keyed on the data version
+
+    Large tables use the planner's pg_class.reltuples estimate instead of a full
+    COUNT(*), so the cost does not grow with the table.
+
+    Returns:
+        Tuple of (count, whether the count is an estimate)
+    """
+    cache_key = (data_version(), table_name)
+    cached = count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    estimate = await session.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": model.__table__.name},
+    )
+    if estimate is not None and estimate >= settings.TABLE_COUNT_ESTIMATE_THRESHOLD:
+        result = (int(estimate), True)
+    else:
+        total = await session.scalar(select(func.count()).select_from(model.__table__))
+        result = (total, False)
+
+    count_cache.set(cache_key, result)
+    return result
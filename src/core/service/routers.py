@@ -1,16 +1,32 @@
 import math
+import hashlib
 import logging
 
 from pathlib import Path
-from sqlalchemy import select, func
-from fastapi.responses import HTMLResponse
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import select
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import APIRouter, Request, Query, HTTPException
 
-from src.config.database import AsyncSessionLocal
+from src.config.database import AsyncSessionLocal, pool_metrics
+from src.config.settings import settings
+from src.core.etl_run import data_version, sync_data_version
+from src.core.metrics import DB_POOL, render_metrics
 from src.core.models.scheme import TableTemplateContext
-from src.db.table import TABLES
+from src.core.service.export import EXPORT_MEDIA_TYPES, export_table
+from src.core.service.pagination import (
+    coerce_cursor_value,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    seek_condition,
+    sortable_columns,
+)
+from src.core.utils import json_codec
+from src.core.utils.cache import TTLCache
+from src.db.table import TABLES, SalesAggregate
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
@@ -20,16 +36,78 @@ router = APIRouter()
 templates_path = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(templates_path))
 
+page_cache = TTLCache(maxsize=settings.PAGE_CACHE_SIZE, ttl=settings.PAGE_CACHE_TTL)
+
+
+def _page_etag(request: Request) -> str:
+    """ETag of a page: the rendered body only depends on the URL and the data version"""
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    key = f"{data_version()}:{request.url.path}?{query}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match names ``etag``
+
+    ``*`` is deliberately not honoured: the 304 is sent before the page is
+    rendered, so it would also answer for tables that do not exist.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+async def _cached_page(request: Request, render: Callable[[], Awaitable[Response]]) -> Response:
+    """
+    Serve a rendered page from the in-process cache
+
+    Entries are keyed on the data version, so they are invalidated when an ETL
+    run in this or any other process finishes (see sync_data_version). Clients
+    presenting a matching If-None-Match get 304 without querying the tables.
+    """
+    await sync_data_version()
+    etag = _page_etag(request)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    cached = page_cache.get(etag)
+    if cached is None:
+        response = await render()
+        cached = (response.body, response.media_type)
+        page_cache.set(etag, cached)
+
+    body, media_type = cached
+    return Response(body, media_type=media_type, headers=headers)
+
 
 @router.get("/", response_class=HTMLResponse)
 async def show_tables(request: Request):
-    try:
-        return templates.TemplateResponse(
-            "tables.html", {"request": request, "tables": list(TABLES.keys())}
-        )
-    except Exception as e:
-        logger.error(f"Error rendering tables page: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    async def render() -> Response:
+        try:
+            return templates.TemplateResponse(
+                "tables.html", {"request": request, "tables": list(TABLES.keys())}
+            )
+        except Exception as e:
+            logger.error(f"Error rendering tables page: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    return await _cached_page(request, render)
+
+
+def _cursor_for(item, sort_column, pk, sort_by, sort_order, page: int, direction: str) -> str:
+    return encode_cursor({
+        "s": sort_by,
+        "o": sort_order,
+        "v": getattr(item, sort_column.key),
+        "k": getattr(item, pk.key),
+        "p": page,
+        "d": direction,
+    })
 
 
 @router.get("/table/{table_name}", response_class=HTMLResponse)
@@ -39,41 +117,86 @@ async def show_table(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     sort_by: str = None,
-    sort_order: str = "asc",
+    sort_order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
 ):
+    return await _cached_page(
+        request,
+        lambda: _render_table(
+            request, table_name, page, per_page, sort_by, sort_order, cursor
+        ),
+    )
+
+
+async def _render_table(
+    request: Request,
+    table_name: str,
+    page: int,
+    per_page: int,
+    sort_by: Optional[str],
+    sort_order: str,
+    cursor: Optional[str],
+) -> Response:
     if table_name not in TABLES:
         raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
 
     model = TABLES[table_name]
+    table = model.__table__
+    pk = table.primary_key.columns[0]
+
+    if sort_by and sort_by not in table.columns:
+        raise HTTPException(status_code=400, detail=f"Invalid sort column '{sort_by}'")
+    if sort_by and sort_by not in sortable_columns(table):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sorting by '{sort_by}' is not supported, "
+                   f"use one of: {', '.join(sortable_columns(table))}",
+        )
+    sort_column = table.columns[sort_by] if sort_by else pk
+    descending = sort_order == "desc"
+
+    backwards = False
+    query = select(model)
+
+    if cursor:
+        try:
+            state = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if state.get("s") != sort_by or state.get("o") != sort_order:
+            raise HTTPException(
+                status_code=400, detail="Cursor does not match the requested sort"
+            )
+        try:
+            value = coerce_cursor_value(sort_column, state["v"])
+            key = coerce_cursor_value(pk, state["k"])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        backwards = state["d"] == "prev"
+        page = state["p"]
+        query = query.where(
+            seek_condition(sort_column, pk, value, key, descending != backwards)
+        )
+    elif page > 1:
+        # Plain page numbers are still accepted for old links, at OFFSET cost
+        query = query.offset((page - 1) * per_page)
+
+    order = (lambda col: col.desc()) if descending != backwards else (lambda col: col.asc())
+    order_by = [order(sort_column)] if sort_column is pk else [order(sort_column), order(pk)]
+    query = query.order_by(*order_by).limit(per_page + 1)
 
     try:
         async with AsyncSessionLocal() as session:
             try:
-                query = select(model)
-
-                if sort_by:
-                    if not hasattr(model, sort_by):
-                        raise HTTPException(
-                            status_code=400, detail=f"Invalid sort column '{sort_by}'"
-                        )
-                    column = getattr(model, sort_by)
-                    query = query.order_by(
-                        column.asc() if sort_order == "asc" else column.desc()
-                    )
-
                 try:
-                    total_items = await session.scalar(
-                        select(func.count()).select_from(model.__table__)
-                    )
-                    total_pages = math.ceil(total_items / per_page)
+                    total_items, total_estimated = await count_rows(session, table_name, model)
+                    total_pages = max(1, math.ceil(total_items / per_page))
                 except SQLAlchemyError as e:
                     logger.error(f"Count query failed: {str(e)}")
                     raise HTTPException(
                         status_code=500, detail="Failed to get record count"
                     )
 
-                query = query.limit(per_page).offset((page - 1) * per_page)
-
                 try:
                     result = await session.execute(query)
                     items = result.scalars().all()
@@ -83,7 +206,25 @@ async def show_table(
                         status_code=500, detail="Failed to fetch table data"
                     )
 
-                columns = [column.key for column in model.__table__.columns]
+                has_more = len(items) > per_page
+                items = items[:per_page]
+                if backwards:
+                    items.reverse()
+
+                has_next = bool(items) and (backwards or has_more)
+                has_prev = bool(items) and (has_more if backwards else page > 1)
+
+                next_cursor = prev_cursor = None
+                if has_next:
+                    next_cursor = _cursor_for(
+                        items[-1], sort_column, pk, sort_by, sort_order, page + 1, "next"
+                    )
+                if has_prev:
+                    prev_cursor = _cursor_for(
+                        items[0], sort_column, pk, sort_by, sort_order, max(1, page - 1), "prev"
+                    )
+
+                columns = [column.key for column in table.columns]
 
                 try:
                     context = TableTemplateContext(
@@ -93,10 +234,13 @@ async def show_table(
                         data=items,
                         page=page,
                         per_page=per_page,
-                        total_pages=total_pages,
+                        total_pages=max(total_pages, page),
                         total_items=total_items,
+                        total_estimated=total_estimated,
                         sort_by=sort_by,
                         sort_order=sort_order,
+                        next_cursor=next_cursor,
+                        prev_cursor=prev_cursor,
                     )
 
                     return templates.TemplateResponse("table.html", context.dict())
@@ -113,3 +257,66 @@ async def show_table(
     except SQLAlchemyError as e:
         logger.error(f"Database connection error: {str(e)}")
         raise HTTPException(status_code=503, detail="Database unavailable")
+
+
+@router.get("/export/{table_name}")
+async def export(
+    table_name: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|json)$"),
+):
+    if table_name not in TABLES:
+        raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
+
+    return StreamingResponse(
+        export_table(TABLES[table_name], format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{table_name}.{format}"'
+        },
+    )
+
+
+@router.get("/api/analytics/sales")
+async def sales_analytics(
+    request: Request,
+    dimension: str = Query("category", pattern="^(category|brand)$"),
+    key: Optional[str] = None,
+):
+    """Precomputed product statistics per category or brand, largest groups first"""
+
+    async def render() -> Response:
+        query = select(SalesAggregate).where(SalesAggregate.dimension == dimension)
+        if key is not None:
+            query = query.where(SalesAggregate.key == key)
+        query = query.order_by(SalesAggregate.product_count.desc(), SalesAggregate.key)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(query)
+                groups = result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Sales analytics query failed: {str(e)}")
+            raise HTTPException(status_code=503, detail="Database unavailable")
+
+        if key is not None and not groups:
+            raise HTTPException(status_code=404, detail=f"No {dimension} '{key}'")
+
+        columns = [column.key for column in SalesAggregate.__table__.columns]
+        items = [{name: getattr(group, name) for name in columns} for group in groups]
+        return Response(
+            json_codec.dumps_bytes({"dimension": dimension, "items": items}, default=str),
+            media_type="application/json",
+        )
+
+    return await _cached_page(request, render)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    for engine_name, engine_metrics in pool_metrics.items():
+        for stat, value in engine_metrics.snapshot().items():
+            DB_POOL.set(value, engine=engine_name, stat=stat)
+
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
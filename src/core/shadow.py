@@ -0,0 +1,108 @@
+import re
+import logging
+import typing as t
+from functools import lru_cache
+
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+_INDEXES_SQL = text("""
+    SELECT c.relname, pg_get_indexdef(i.indexrelid)
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = CAST(:table_name AS regclass)
+""")
+
+_SERIAL_SEQUENCE_SQL = text("SELECT pg_get_serial_sequence(:table_name, :column_name)")
+
+
+def shadow_name(table: Table) -> str:
+    return f"{table.name}_next"
+
+
+@lru_cache(maxsize=None)
+def shadow_table(table: Table) -> Table:
+    """Table object for the ``<name>_next`` shadow copy, to build statements against"""
+    return table.to_metadata(MetaData(), name=shadow_name(table))
+
+
+def _index_shape(name: str, table_name: str, definition: str) -> str:
+    """Index definition with its own and its table's names removed, for matching"""
+    definition = definition.replace(f" {name} ", " ", 1)
+    return re.sub(rf"\bON (\w+\.)?{table_name}\b", "ON", definition, count=1)
+
+
+async def _indexes(db_session: AsyncSession, table_name: str) -> t.Dict[str, str]:
+    result = await db_session.execute(_INDEXES_SQL, {"table_name": table_name})
+    return {
+        _index_shape(name, table_name, definition): name
+        for name, definition in result.all()
+    }
+
+
+async def prepare_shadow(db_session: AsyncSession, table: Table) -> Table:
+    """
+    Create an empty ``<name>_next`` copy of a table, with its defaults,
+    constraints and indexes, in the session's transaction
+
+    Returns:
+        The shadow table to fill before calling swap_shadow
+    """
+    name = shadow_name(table)
+    await db_session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+    await db_session.execute(text(f'CREATE TABLE "{name}" (LIKE "{table.name}" INCLUDING ALL)'))
+    return shadow_table(table)
+
+
+async def swap_shadow(db_session: AsyncSession, table: Table) -> None:
+    """
+    Replace a table with its filled shadow copy by renaming, then drop the old one
+
+    Runs in the caller's transaction: readers keep seeing the old table until
+    the caller commits, and then see the new one in full. Index names and the
+    ownership of serial sequences are carried over, so the swapped-in table is
+    indistinguishable from the one it replaces.
+    """
+    name = table.name
+    shadow = shadow_name(table)
+    retired = f"{name}_old"
+
+    await db_session.execute(text(f'ANALYZE "{shadow}"'))
+    await db_session.execute(
+        text(f"SET LOCAL lock_timeout = {int(settings.MART_SWAP_LOCK_TIMEOUT_MS)}")
+    )
+
+    live_indexes = await _indexes(db_session, name)
+    shadow_indexes = await _indexes(db_session, shadow)
+
+    await db_session.execute(text(f'ALTER TABLE "{name}" RENAME TO "{retired}"'))
+    await db_session.execute(text(f'ALTER TABLE "{shadow}" RENAME TO "{name}"'))
+
+    for column in table.columns:
+        params = {"column_name": column.name}
+        old_sequence = (await db_session.execute(
+            _SERIAL_SEQUENCE_SQL, {"table_name": retired, **params}
+        )).scalar()
+        new_sequence = (await db_session.execute(
+            _SERIAL_SEQUENCE_SQL, {"table_name": name, **params}
+        )).scalar()
+        if old_sequence and not new_sequence:
+            # The copied serial default still uses the old table's sequence;
+            # hand it over so dropping the old table does not take it along
+            await db_session.execute(
+                text(f'ALTER SEQUENCE {old_sequence} OWNED BY "{name}"."{column.name}"')
+            )
+
+    await db_session.execute(text(f'DROP TABLE "{retired}"'))
+
+    for shape, index_name in shadow_indexes.items():
+        original = live_indexes.get(shape)
+        if original and original != index_name:
+            await db_session.execute(text(f'ALTER INDEX "{index_name}" RENAME TO "{original}"'))
+
+    logger.info(f"Swapped {shadow} in as {name}")
@@ -0,0 +1,59 @@
+import typing as t
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+from sqlalchemy import Table
+
+from src.core.columnar import ColumnarTransform, compile_columnar_transform
+from src.core.transform_codegen import BatchTransform, FieldMapping, compile_transform
+from src.core.validation import RecordValidator
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """
+    Declarative description of an API source loaded into a table.
+
+    Attributes:
+        name: Unique source name, used in run statistics and metrics
+        endpoint: API URL
+        data_key: Key of the record list in the API response
+        table: Target table
+        fields: Target column -> source mapping, see Field
+        conflict_key: Column used for ON CONFLICT
+        exclude_fields: Columns never overwritten on conflict
+        load_mode: Per-source load mode override ("upsert" or "copy")
+        schema: Pydantic model every API record is validated against before
+            the transform; invalid records are quarantined
+    """
+
+    name: str
+    endpoint: str
+    data_key: str
+    table: Table
+    fields: FieldMapping
+    conflict_key: str = "id"
+    exclude_fields: t.Tuple[str, ...] = ()
+    load_mode: t.Optional[str] = None
+    schema: t.Optional[t.Type[BaseModel]] = None
+    validator: t.Optional[RecordValidator] = field(init=False, repr=False, compare=False)
+    transform: BatchTransform = field(init=False, repr=False, compare=False)
+    columnar_transform: ColumnarTransform = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "transform", compile_transform(self.fields))
+        object.__setattr__(self, "columnar_transform", compile_columnar_transform(self.fields))
+        object.__setattr__(
+            self, "validator", RecordValidator(self.schema) if self.schema is not None else None
+        )
+
+
+SOURCES: t.Dict[str, SourceSpec] = {}
+
+
+def register_source(spec: SourceSpec) -> SourceSpec:
+    """Add a source to the registry loaded by the ETL run, see load_nodes"""
+    if spec.name in SOURCES:
+        raise ValueError(f"Source '{spec.name}' is already registered")
+    SOURCES[spec.name] = spec
+    return spec
@@ -0,0 +1,76 @@
+import typing as t
+
+REQUIRED = object()
+
+Row = t.Dict[str, t.Any]
+BatchTransform = t.Callable[[t.List[Row]], t.List[Row]]
+
+
+class Field(t.NamedTuple):
+    """
+    Mapping of one target column.
+
+    Attributes:
+        source: Key in the API record, dotted for nested keys ("name.firstname")
+        convert: Callable applied to the source value
+        default: Value used when the key is missing; REQUIRED makes a missing key an error
+    """
+
+    source: str
+    convert: t.Optional[t.Callable[[t.Any], t.Any]] = None
+    default: t.Any = REQUIRED
+
+
+FieldMapping = t.Dict[str, t.Union[str, Field, "FieldMapping"]]
+
+
+class TransformCodegen:
+    """Builds Python source for field mappings, collecting the referenced callables and defaults"""
+
+    def __init__(self):
+        self.namespace: t.Dict[str, t.Any] = {}
+
+    def bind(self, prefix: str, value: t.Any) -> str:
+        name = f"_{prefix}_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def access(self, spec: Field) -> str:
+        """Expression reading the (unconverted) source value from ``item``"""
+        keys = spec.source.split(".")
+        expr = "item" + "".join(f"[{key!r}]" for key in keys[:-1])
+        if spec.default is REQUIRED:
+            return f"{expr}[{keys[-1]!r}]"
+        return f"{expr}.get({keys[-1]!r}, {self.bind('default', spec.default)})"
+
+    def value(self, spec: t.Union[str, Field, FieldMapping]) -> str:
+        """Expression producing the converted target value from ``item``"""
+        if isinstance(spec, dict):
+            return self.row(spec)
+        if isinstance(spec, str):
+            spec = Field(spec)
+        value = self.access(spec)
+        if spec.convert is not None:
+            value = f"{self.bind('convert', spec.convert)}({value})"
+        return value
+
+    def row(self, mapping: FieldMapping) -> str:
+        """Dict literal expression building a whole row from ``item``"""
+        return "{" + ", ".join(f"{target!r}: {self.value(spec)}" for target, spec in mapping.items()) + "}"
+
+    def compile(self, source: str, name: str) -> t.Callable:
+        exec(compile(source, "<source transform>", "exec"), self.namespace)
+        return self.namespace[name]
+
+
+def compile_transform(fields: FieldMapping) -> BatchTransform:
+    """
+    Compile a field mapping into a batch transform function
+
+    The mapping is turned into the source of a single list comprehension that
+    builds every row as a dict literal, so no mapping metadata is interpreted
+    per row. Nested mappings produce nested dicts (e.g. JSON columns).
+    """
+    codegen = TransformCodegen()
+    source = f"def transform(items):\n    return [{codegen.row(fields)} for item in items]\n"
+    return codegen.compile(source, "transform")
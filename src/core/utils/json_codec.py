@@ -0,0 +1,78 @@
+"""
+Pluggable JSON codec: orjson or msgspec when installed, the stdlib otherwise.
+
+The backend is picked once at import time from the JSON_BACKEND setting
+("auto", "orjson", "msgspec" or "json").
+"""
+import json
+import logging
+import typing as t
+
+from src.config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional speed-up
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+Default = t.Optional[t.Callable[[t.Any], t.Any]]
+
+
+def _available_backend(requested: str) -> str:
+    available = {
+        "orjson": orjson is not None,
+        "msgspec": msgspec is not None,
+        "json": True,
+    }
+    if requested == "auto":
+        return next(name for name, present in available.items() if present)
+    if requested not in available:
+        raise ValueError(f"Unknown JSON backend '{requested}'")
+    if not available[requested]:
+        logger.warning(f"JSON backend '{requested}' is not installed, using the stdlib")
+        return "json"
+    return requested
+
+
+BACKEND = _available_backend(settings.JSON_BACKEND)
+
+if BACKEND == "orjson":
+    DecodeError: t.Tuple[t.Type[Exception], ...] = (orjson.JSONDecodeError,)
+
+    def loads(data: t.Union[bytes, str]) -> t.Any:
+        return orjson.loads(data)
+
+    def dumps_bytes(obj: t.Any, default: Default = None) -> bytes:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+elif BACKEND == "msgspec":
+    DecodeError = (msgspec.DecodeError,)
+    _decoder = msgspec.json.Decoder()
+
+    def loads(data: t.Union[bytes, str]) -> t.Any:
+        return _decoder.decode(data)
+
+    def dumps_bytes(obj: t.Any, default: Default = None) -> bytes:
+        return msgspec.json.encode(obj, enc_hook=default)
+
+else:
+    DecodeError = (json.JSONDecodeError,)
+
+    def loads(data: t.Union[bytes, str]) -> t.Any:
+        return json.loads(data)
+
+    def dumps_bytes(obj: t.Any, default: Default = None) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode()
+
+
+def dumps(obj: t.Any, default: Default = None) -> str:
+    """Serialize to a compact JSON string with the selected backend"""
+    return dumps_bytes(obj, default).decode()
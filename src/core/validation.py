@@ -0,0 +1,76 @@
+import logging
+import typing as t
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.core.exception import ExtractionError
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+Record = t.Dict[str, t.Any]
+
+
+class Reject(t.NamedTuple):
+    """A source record that failed validation, with its position in the batch"""
+
+    index: int
+    record: t.Any
+    errors: t.List[t.Dict[str, t.Any]]
+
+    @property
+    def record_id(self) -> t.Optional[str]:
+        if isinstance(self.record, dict) and self.record.get("id") is not None:
+            return str(self.record["id"])
+        return None
+
+
+class RecordValidator:
+    """
+    Validates whole batches of API records against a pydantic schema
+
+    The list adapter is compiled once, so a batch is validated in a single call
+    into pydantic-core instead of building one model per record in Python.
+    Validation only filters: the valid records are returned exactly as the API
+    sent them and type conversion is left to the source's compiled transform.
+    """
+
+    def __init__(self, schema: t.Type[BaseModel]):
+        self.schema = schema
+        self.adapter = TypeAdapter(t.List[schema])
+
+    def validate(self, records: t.List[t.Any]) -> t.Tuple[t.List[Record], t.List[Reject]]:
+        """
+        Validate a batch of records
+
+        Args:
+            records: Raw records decoded from the API
+
+        Returns:
+            The valid records unchanged, and the rejected ones with their errors
+
+        Raises:
+            ExtractionError: If the batch itself is not a list of records
+        """
+        try:
+            self.adapter.validate_python(records)
+            return records, []
+        except ValidationError as e:
+            errors = e.errors(include_url=False)
+
+        grouped: t.Dict[int, t.List[t.Dict[str, t.Any]]] = {}
+        for error in errors:
+            if not error["loc"]:
+                raise ExtractionError(f"Expected a list of {self.schema.__name__} records")
+            grouped.setdefault(error["loc"][0], []).append({
+                "loc": list(error["loc"][1:]),
+                "type": error["type"],
+                "msg": error["msg"],
+            })
+
+        valid = [record for index, record in enumerate(records) if index not in grouped]
+        rejects = [Reject(index, records[index], grouped[index]) for index in sorted(grouped)]
+        logger.warning(
+            f"{len(rejects)} of {len(records)} {self.schema.__name__} records failed validation"
+        )
+        return valid, rejects
@@ -1,5 +1,9 @@
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, Float, Boolean, JSON, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, Index, DateTime, func
+
+from src.config.settings import settings
+from src.core.marts import MART_BACKEND_MATVIEW
 
 Base = declarative_base()
 
@@ -19,6 +23,12 @@ class ProductDB(Base):
     discount = Column(Integer, nullable=True)
     popular = Column(Boolean, nullable=True)
     on_sale = Column(Boolean, nullable=True)
+    content_hash = Column(String(32), nullable=True)
+
+    __table_args__ = (
+        Index("ix_products_price", price.desc()),
+        Index("ix_products_category", category),
+    )
 
 
 class UserDB(Base):
@@ -28,9 +38,15 @@ class UserDB(Base):
     email = Column(String(255), unique=True, nullable=False)
     username = Column(String(100), unique=True, nullable=False)
     password = Column(String(255), nullable=False)
-    name = Column(JSON, nullable=False)
-    address = Column(JSON, nullable=False)
+    name = Column(JSONB, nullable=False)
+    address = Column(JSONB, nullable=False)
     phone = Column(String(50))
+    content_hash = Column(String(32), nullable=True)
+
+    __table_args__ = (
+        Index("ix_users_name_gin", name, postgresql_using="gin"),
+        Index("ix_users_address_gin", address, postgresql_using="gin"),
+    )
 
 
 class MostExpensive(Base):
@@ -56,10 +72,112 @@ class OdsUser(Base):
     zipcode = Column(String(20))
     city = Column(String(100))
 
+    __table_args__ = (
+        Index("uq_ods_users_user_id", user_id, unique=True),
+    )
+
+
+class EtlRunDB(Base):
+    __tablename__ = 'etl_runs'
+
+    run_id = Column(String(32), primary_key=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+    success = Column(Boolean, nullable=False)
+    duration_seconds = Column(Float)
+    db_seconds = Column(Float)
+    stages = Column(JSONB)
+    stats = Column(JSONB)
+    bytes_fetched = Column(JSONB)
+    transformations = Column(JSONB)
+
+    __table_args__ = (
+        Index("ix_etl_runs_started_at", started_at),
+    )
+
+
+class EtlRejectDB(Base):
+    __tablename__ = 'etl_rejects'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(100), nullable=False)
+    stage = Column(String(20), nullable=False)
+    record_id = Column(String(100))
+    run_id = Column(String(32))
+    payload = Column(JSONB)
+    errors = Column(JSONB)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    resolved_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_etl_rejects_source_created_at", source, created_at),
+        Index("ix_etl_rejects_unresolved", source, id, postgresql_where=resolved_at.is_(None)),
+        Index(
+            "uq_etl_rejects_unresolved_record", source, stage, record_id,
+            unique=True, postgresql_where=resolved_at.is_(None),
+        ),
+    )
+
+
+class SalesAggregate(Base):
+    """Per-category and per-brand product statistics, see SalesAggregatesTransformer"""
+
+    __tablename__ = 'sales_aggregates'
+
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    product_count = Column(Integer, nullable=False)
+    min_price = Column(Float)
+    avg_price = Column(Float)
+    max_price = Column(Float)
+    discounted_count = Column(Integer, nullable=False)
+    avg_discount = Column(Float)
+    discount_distribution = Column(JSONB, nullable=False)
+    on_sale_count = Column(Integer, nullable=False)
+    on_sale_share = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class MvMostExpensive(Base):
+    """Materialized view maintained by migrations, refreshed by the matview mart backend"""
+
+    __tablename__ = 'mv_most_expensive'
+    __table_args__ = {"info": {"materialized_view": True}}
+
+    product_id = Column(Integer, primary_key=True)
+    product_name = Column(String(255))
+    price = Column(Float)
+    category = Column(String(100))
+
+
+class MvCategorySummary(Base):
+    """Materialized view maintained by migrations, refreshed by the matview mart backend"""
+
+    __tablename__ = 'mv_category_summary'
+    __table_args__ = {"info": {"materialized_view": True}}
+
+    category = Column(String(100), primary_key=True)
+    product_count = Column(Integer)
+    min_price = Column(Float)
+    avg_price = Column(Float)
+    max_price = Column(Float)
+    on_sale_count = Column(Integer)
+
 
 TABLES = {
     "products": ProductDB,
     "users": UserDB,
     "most_expensive": MostExpensive,
-    "ods_users": OdsUser
-}
\ No newline at end of file
+    "ods_users": OdsUser,
+    "etl_runs": EtlRunDB,
+    "etl_rejects": EtlRejectDB,
+}
+
+if settings.MART_BACKEND == MART_BACKEND_MATVIEW:
+    # The matview backend never rebuilds most_expensive, so it would only serve stale rows
+    del TABLES["most_expensive"]
+    TABLES.update({
+        "mv_most_expensive": MvMostExpensive,
+        "mv_category_summary": MvCategorySummary,
+    })
\ No newline at end of file
@@ -2,12 +2,14 @@ import sys
 import logging
 import uvicorn
 import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from src.config.database import AsyncSessionLocal
-from src.core.data_loader import load_all_data
-from src.core.data_transform import run_transformations
+from src.config.settings import settings
+from src.core.http_client import close_http_client
+from src.core.pipeline import run_etl
+from src.core.scheduler import EtlScheduler
 from src.core.service import routers
 
 if sys.platform == "win32":
@@ -17,21 +19,38 @@ logger = logging.getLogger(__name__)
 logger.propagate = False
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = None
+    if settings.ETL_SCHEDULE_ENABLED:
+        scheduler = EtlScheduler(
+            run_etl,
+            interval_seconds=settings.ETL_SCHEDULE_INTERVAL_SECONDS,
+            cron=settings.ETL_SCHEDULE_CRON,
+            run_on_startup=settings.ETL_RUN_ON_STARTUP,
+        )
+        scheduler.start()
+    try:
+        yield
+    finally:
+        if scheduler is not None:
+            await scheduler.stop()
+        await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(routers.router)
 
 
 async def main():
-    async with AsyncSessionLocal() as session:
-        success = await load_all_data(session)
-        await run_transformations(session)
-
-        if success:
-            logger.info("Data loading completed successfully")
-        else:
-            logger.error("Data loading encountered errors")
+    try:
+        await run_etl()
+    finally:
+        await close_http_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    if "--once" in sys.argv:
+        asyncio.run(main())
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,14 @@
+import os
+
+# Settings requires these; the tests never connect to a real database
+for name, value in {
+    "POSTGRES_USER": "etl",
+    "POSTGRES_PASSWORD": "etl",
+    "POSTGRES_DB": "etl",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "OS": "linux",
+    "API_PRODUCTS": "http://localhost/products",
+    "API_USERS": "http://localhost/users",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,24 @@
+from src.core.columnar import ColumnBatch
+from src.core.data_extraction import BaseDataLoader, content_hash
+
+
+RECORDS = [
+    {"id": 1, "title": "Lamp", "price": 9.99, "on_sale": True, "address": {"b": 1, "a": None}},
+    {"id": 2, "title": "Desk", "price": 120.0, "on_sale": False, "address": None},
+]
+
+
+def test_columnar_hashes_match_dict_hashes():
+    rows = BaseDataLoader.add_content_hashes([dict(record) for record in RECORDS])
+    columns = ColumnBatch({name: [record[name] for record in RECORDS] for name in RECORDS[0]})
+
+    BaseDataLoader.add_content_hashes(columns)
+
+    assert columns.columns["content_hash"] == [row["content_hash"] for row in rows]
+    assert [row["content_hash"] for row in rows] == [content_hash(record) for record in RECORDS]
+
+
+def test_content_hash_ignores_key_order():
+    record = RECORDS[0]
+    assert content_hash(record) == content_hash(dict(reversed(list(record.items()))))
+    assert content_hash(record) != content_hash(RECORDS[1])
@@ -0,0 +1,25 @@
+import asyncio
+
+from src.core.dag import STATUS_SUCCESS, Dag, Node
+
+
+def test_pool_limit_only_bounds_its_own_nodes():
+    running = set()
+    overlaps = []
+
+    def node(name, pool=None):
+        async def func(db_session):
+            running.add(name)
+            overlaps.append(set(running))
+            await asyncio.sleep(0.01)
+            running.discard(name)
+            return name
+
+        return Node(name, func, outputs=(name,), pool=pool)
+
+    dag = Dag([node("load.a", "load"), node("load.b", "load"), node("transform.c")])
+    results = asyncio.run(dag.run(max_concurrency=3, pool_limits={"load": 1}))
+
+    assert all(result.status == STATUS_SUCCESS for result in results.values())
+    assert not any({"load.a", "load.b"} <= seen for seen in overlaps)
+    assert any("transform.c" in seen and len(seen) > 1 for seen in overlaps)
@@ -0,0 +1,18 @@
+from starlette.requests import Request
+
+from src.core.service.routers import _etag_matches
+
+
+def make_request(if_none_match=None):
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_matches_listed_tags():
+    assert _etag_matches(make_request('"a", W/"b"'), '"b"')
+    assert not _etag_matches(make_request('"a"'), '"b"')
+    assert not _etag_matches(make_request(), '"b"')
+
+
+def test_wildcard_does_not_match():
+    assert not _etag_matches(make_request("*"), '"b"')
@@ -0,0 +1,50 @@
+import pytest
+
+from src.core.data_transform import OdsUsersTransformer
+from src.core.exception import UserProcessingError
+from src.db.table import UserDB
+
+
+def make_user(name, address):
+    return UserDB(id=1, name=name, address=address)
+
+
+def test_json_nulls_match_the_pushdown_defaults():
+    user = make_user(
+        {"firstname": None, "lastname": None},
+        {
+            "number": None, "street": None, "zipcode": None, "city": None,
+            "geolocation": {"lat": None, "long": None},
+        },
+    )
+    ods_user = OdsUsersTransformer.build_ods_user(user)
+
+    assert (ods_user.firstname, ods_user.lastname) == ("", "")
+    assert (ods_user.street_number, ods_user.street, ods_user.zipcode, ods_user.city) == (
+        "", "", "", ""
+    )
+    assert (ods_user.lat, ods_user.long) == (0.0, 0.0)
+
+
+def test_missing_or_null_geolocation_defaults_to_zero():
+    for address in ({"city": "Kilcoole"}, {"city": "Kilcoole", "geolocation": None}):
+        ods_user = OdsUsersTransformer.build_ods_user(make_user({}, address))
+        assert (ods_user.lat, ods_user.long, ods_user.city) == (0.0, 0.0, "Kilcoole")
+
+
+def test_values_are_rendered_like_the_json_text_operator():
+    user = make_user(
+        {"firstname": "John", "lastname": 7},
+        {"number": 7682, "zipcode": True, "geolocation": {"lat": " -37.3159 ", "long": 81}},
+    )
+    ods_user = OdsUsersTransformer.build_ods_user(user)
+
+    assert (ods_user.lastname, ods_user.street_number, ods_user.zipcode) == ("7", "7682", "true")
+    assert (ods_user.lat, ods_user.long) == (-37.3159, 81.0)
+
+
+@pytest.mark.parametrize("lat", ["north", True, "nan", {"deg": 1}])
+def test_non_numeric_coordinates_are_rejected(lat):
+    user = make_user({}, {"geolocation": {"lat": lat}})
+    with pytest.raises(UserProcessingError):
+        OdsUsersTransformer.build_ods_user(user)
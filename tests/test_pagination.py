@@ -0,0 +1,63 @@
+import pytest
+
+from src.core.service.pagination import (
+    coerce_cursor_value,
+    decode_cursor,
+    encode_cursor,
+    sortable_columns,
+)
+from src.db.table import OdsUser, ProductDB, UserDB
+
+
+def test_sortable_columns_include_btree_index_columns():
+    columns = sortable_columns(ProductDB.__table__)
+
+    assert "id" in columns
+    assert "price" in columns
+    assert "category" in columns
+
+
+def test_sortable_columns_include_unique_index_columns():
+    assert "user_id" in sortable_columns(OdsUser.__table__)
+
+
+def test_sortable_columns_skip_gin_indexes():
+    columns = sortable_columns(UserDB.__table__)
+
+    assert {"id", "email", "username"} <= set(columns)
+    assert "name" not in columns
+    assert "address" not in columns
+
+
+def test_decode_cursor_round_trip():
+    payload = {"s": "price", "o": "desc", "v": 9.99, "k": 3, "p": 2, "d": "next"}
+
+    assert decode_cursor(encode_cursor(payload)) == payload
+
+
+@pytest.mark.parametrize("changes", [{"p": "2"}, {"p": 0}, {"p": True}, {"d": "sideways"}])
+def test_decode_cursor_rejects_invalid_fields(changes):
+    payload = {"s": None, "o": "asc", "v": 1, "k": 1, "p": 2, "d": "next", **changes}
+
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(payload))
+
+
+def test_coerce_cursor_value_accepts_column_types():
+    table = ProductDB.__table__
+
+    assert coerce_cursor_value(table.c.price, 10) == 10.0
+    assert coerce_cursor_value(table.c.category, None) is None
+    assert coerce_cursor_value(table.c.id, 5) == 5
+
+
+@pytest.mark.parametrize("column, value", [
+    ("id", "5"),
+    ("id", True),
+    ("id", None),
+    ("price", "cheap"),
+    ("category", 7),
+])
+def test_coerce_cursor_value_rejects_wrong_types(column, value):
+    with pytest.raises(ValueError):
+        coerce_cursor_value(ProductDB.__table__.c[column], value)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from src.core.scheduler import CronExpression
+
+
+def test_parse_field_forms():
+    parse = CronExpression._parse_field
+    assert parse("*", 0, 5) == {0, 1, 2, 3, 4, 5}
+    assert parse("7", 0, 59) == {7}
+    assert parse("1-3,10", 0, 59) == {1, 2, 3, 10}
+    assert parse("*/20", 0, 59) == {0, 20, 40}
+    assert parse("10-30/10", 0, 59) == {10, 20, 30}
+
+
+def test_single_value_with_step_runs_to_field_maximum():
+    assert CronExpression._parse_field("5/15", 0, 59) == {5, 20, 35, 50}
+
+
+@pytest.mark.parametrize("field", ["60", "5-2", "*/0", "a", "1-"])
+def test_parse_field_rejects_invalid(field):
+    with pytest.raises(ValueError):
+        CronExpression._parse_field(field, 0, 59)
+
+
+@pytest.mark.parametrize("expression", ["0 0 30 2 *", "0 0 31 4 *", "* * *"])
+def test_invalid_expression_fails_at_construction(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_next_after():
+    cron = CronExpression("30 2 * * *")
+    assert cron.next_after(datetime(2024, 1, 1, 3, 0)) == datetime(2024, 1, 2, 2, 30)
+
+    weekly = CronExpression("0 9 * * 1")
+    # 2024-01-01 was a Monday
+    assert weekly.next_after(datetime(2024, 1, 1, 9, 0)) == datetime(2024, 1, 8, 9, 0)
+
+
+def test_day_and_weekday_restrictions_combine_with_or():
+    cron = CronExpression("0 0 15 * 0")
+    # Sunday 2024-01-07 comes before the 15th
+    assert cron.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7)
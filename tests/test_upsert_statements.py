@@ -0,0 +1,24 @@
+from sqlalchemy.dialects import postgresql
+
+from src.core.data_extraction import _merge_statement, _upsert_statement
+from src.db.table import OdsUser, ProductDB
+
+UNCHANGED_GUARD = (
+    "WHERE excluded.content_hash IS NULL "
+    "OR products.content_hash IS DISTINCT FROM excluded.content_hash"
+)
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_and_merge_skip_rows_with_an_unchanged_hash():
+    table = ProductDB.__table__
+    assert compile_sql(_upsert_statement(table, "id", frozenset())).endswith(UNCHANGED_GUARD)
+    assert compile_sql(_merge_statement(table, "id", frozenset())).endswith(UNCHANGED_GUARD)
+
+
+def test_tables_without_a_hash_always_update():
+    sql = compile_sql(_upsert_statement(OdsUser.__table__, "user_id", frozenset()))
+    assert "WHERE" not in sql.split("ON CONFLICT", 1)[1]
@@ -0,0 +1,44 @@
+from src.core.models.scheme import User
+from src.core.validation import RecordValidator
+
+
+def make_user(**overrides):
+    user = {
+        "id": 1,
+        "email": "john@example.com",
+        "username": "john",
+        "password": "secret",
+        "name": {"firstname": "John", "lastname": "Doe"},
+        "address": {
+            "city": "Kilcoole",
+            "street": "Lovers Ln",
+            "number": 7682,
+            "zipcode": "12926-3874",
+            "geolocation": {"lat": "-37.3159", "long": "81.1496"},
+            "suite": "Apt. 4",
+        },
+        "phone": "1-570-236-7033",
+    }
+    user.update(overrides)
+    return user
+
+
+def test_valid_records_are_returned_as_sent():
+    records = [make_user()]
+    valid, rejects = RecordValidator(User).validate(records)
+
+    assert rejects == []
+    assert valid == [make_user()]
+    assert valid[0]["address"]["suite"] == "Apt. 4"
+    assert valid[0]["address"]["geolocation"]["lat"] == "-37.3159"
+    assert valid[0]["address"]["number"] == 7682
+
+
+def test_invalid_records_are_rejected_and_the_rest_kept_as_sent():
+    records = [make_user(), make_user(id=2, email=None), make_user(id=3)]
+    valid, rejects = RecordValidator(User).validate(records)
+
+    assert valid == [records[0], records[2]]
+    assert [reject.index for reject in rejects] == [1]
+    assert rejects[0].record_id == "2"
+    assert rejects[0].errors[0]["loc"] == ["email"]